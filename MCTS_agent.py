@@ -1,21 +1,44 @@
+import logging
 import math
 import random
-import os
-from copy import deepcopy
-from typing import List, Tuple, Optional, Dict
-
-class ZhaJinHuaState:
-    """Represents a state in the Zha Jin Hua game"""
-    def __init__(self, player_hand: List[str], player_coins: int, opponent_coins: int,
-                 player_bet: int, opponent_bet: int, is_dealer: bool):
-        self.player_hand = player_hand
-        self.player_coins = player_coins
-        self.opponent_coins = opponent_coins
-        self.player_bet = player_bet
-        self.opponent_bet = opponent_bet
-        self.is_dealer = is_dealer
-        self.game_over = False
-        self.winner = None
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional, Dict, NamedTuple, Union
+import numpy as np
+from cards import PAIR, Card, encode_hand, hand_score, hand_ordinal, lookup_index
+from cfr_solver import CFRPolicy
+from equity import OpponentRange, showdown_equity
+from policy_table import PolicyTable
+
+logger = logging.getLogger(__name__)
+
+class _StateFields(NamedTuple):
+    player_hand: Tuple[Card, ...]
+    player_coins: int
+    opponent_coins: int
+    player_bet: int
+    opponent_bet: int
+    is_dealer: bool
+    game_over: bool = False
+    winner: Optional[str] = None
+
+class ZhaJinHuaState(_StateFields):
+    """
+    Represents a state in the Zha Jin Hua game.
+    States are immutable tuples; transitions build a new state with _replace,
+    so MCTS never needs to copy them.
+    """
+    __slots__ = ()
+
+    def __new__(cls, player_hand: List[Card], player_coins: int, opponent_coins: int,
+                player_bet: int, opponent_bet: int, is_dealer: bool,
+                game_over: bool = False, winner: Optional[str] = None) -> 'ZhaJinHuaState':
+        # Store the hand as card ids so rewards never re-parse image paths
+        hand = encode_hand(player_hand)
+        if hand is None:
+            hand = tuple(player_hand)
+        return super().__new__(cls, hand, player_coins, opponent_coins,
+                               player_bet, opponent_bet, is_dealer, game_over, winner)
 
     def get_possible_actions(self) -> List[str]:
         """Returns list of possible actions in current state"""
@@ -59,221 +82,477 @@ class MCTSNode:
                   for action, child in self.children.items()]
         return max(choices, key=lambda x: x[1])[0]
 
-    def rollout_policy(self, possible_actions: List[str]) -> str:
-        """Random policy for rollout phase"""
-        return random.choice(possible_actions)
-
 class ZhaJinHuaScoreCalculator:
     """Calculates scores for Zha Jin Hua hands"""
     @staticmethod
-    def calculate_score(hand: List[str]) -> Tuple[int, int]:
+    def calculate_score(hand: List[Card]) -> Tuple[int, int]:
         """
         Calculate score for Zha Jin Hua hand
         Returns (hand_type_rank, high_card_value)
         """
-        # Parse cards from filenames
-        cards = []
-        for card_path in hand:
-            filename = os.path.basename(card_path)
-            print(f"Processing filename: {filename}")  # Debug print
-            
-            # Split filename and extract rank and suit
-            # Expected format is like "2_of_hearts.png" or similar
-            try:
-                # Remove .png extension first
-                name_without_ext = filename.split('.')[0]
-                parts = name_without_ext.split('_')
-                
-                # Extract rank from the first part
-                rank = parts[0]
-                
-                # Extract suit from the last part
-                suit = parts[-1]
-                
-                print(f"Extracted rank: {rank}, suit: {suit}")  # Debug print
-                
-                # Convert rank to numeric value
-                rank_value = {
-                    'ace': 14, 'king': 13, 'queen': 12, 'jack': 11,
-                    '10': 10, '9': 9, '8': 8, '7': 7,
-                    '6': 6, '5': 5, '4': 4, '3': 3, '2': 2
-                }.get(rank.lower(), int(rank) if rank.isdigit() else 0)
-                
-                cards.append((rank_value, suit))
-                
-            except Exception as e:
-                print(f"Error processing card {filename}: {str(e)}")
-                continue
-        
-        if not cards:  # If no cards were successfully processed
-            return 2, 2  # Return lowest possible score
-        
-        # Sort cards by value for easier comparison
-        cards.sort(reverse=True)
-        values = [card[0] for card in cards]
-        suits = [card[1] for card in cards]
-        
-        # Check for Three of a Kind (豹子)
-        if len(set(values)) == 1:
-            return 7, max(values)
-        
-        # Check for Flush (同花)
-        is_flush = len(set(suits)) == 1
-        
-        # Check for Straight (顺子)
-        is_straight = False
-        straight_value = 0
-        
-        # Special case: Ace-2-3 straight
-        if set(values) == {14, 2, 3}:
-            is_straight = True
-            straight_value = 3
-        # Normal straight
-        elif max(values) - min(values) == 2 and len(set(values)) == 3:
-            is_straight = True
-            straight_value = max(values)
-        
-        # Straight Flush (同花顺)
-        if is_straight and is_flush:
-            return 6, straight_value or max(values)
-        
-        # Flush (同花)
-        if is_flush:
-            return 5, max(values)
-        
-        # Straight (顺子)
-        if is_straight:
-            return 4, straight_value or max(values)
-        
-        # Pair (对子)
-        if len(set(values)) == 2:
-            for value in values:
-                if values.count(value) == 2:
-                    return 3, value
-        
-        # High Card (单张)
-        return 2, max(values)
+        return hand_score(hand)
+
+    @staticmethod
+    def hand_ordinal(hand: List[Card]) -> int:
+        """
+        Strength ordinal of a hand with full kicker tie-breaking.
+        Compare two hands by comparing their ordinals.
+        """
+        return hand_ordinal(hand)
+
+class SearchStats:
+    """
+    Counters and phase timings of one search, filled in when a search is asked
+    for them. Timings are in seconds; root_visits maps each root action to its
+    visit count and root_values to its mean reward. source says what produced
+    the action: 'mcts', 'parallel', 'cfr', 'table' or 'terminal'.
+    """
+    __slots__ = ('source', 'iterations', 'nodes', 'max_depth', 'total_depth', 'rollout_steps',
+                 'selection_s', 'expansion_s', 'rollout_s', 'backprop_s', 'elapsed_s',
+                 'root_visits', 'root_values')
+
+    def __init__(self, source: str = 'mcts'):
+        self.source = source
+        self.iterations = 0
+        self.nodes = 0             # Nodes added to the tree
+        self.max_depth = 0         # Deepest tree node reached by selection and expansion
+        self.total_depth = 0
+        self.rollout_steps = 0
+        self.selection_s = 0.0
+        self.expansion_s = 0.0
+        self.rollout_s = 0.0
+        self.backprop_s = 0.0
+        self.elapsed_s = 0.0
+        self.root_visits: Dict[str, float] = {}
+        self.root_values: Dict[str, float] = {}
+
+    @property
+    def mean_depth(self) -> float:
+        return self.total_depth / self.iterations if self.iterations else 0.0
+
+    @property
+    def decisiveness(self) -> float:
+        """Share of root visits that went to the most visited action (1.0 = unanimous)"""
+        total = sum(self.root_visits.values())
+        return max(self.root_visits.values()) / total if total else 0.0
+
+    def record_root(self, root_stats: Dict[str, Tuple[float, float]]) -> None:
+        """Keep the visits and mean value of each root action from MCTS.search's statistics"""
+        self.root_visits = {action: visits for action, (visits, _) in root_stats.items()}
+        self.root_values = {action: value / visits for action, (visits, value) in root_stats.items() if visits}
+
+    def as_dict(self) -> Dict[str, object]:
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats['mean_depth'] = self.mean_depth
+        stats['decisiveness'] = self.decisiveness
+        return stats
+
+    def summary(self) -> str:
+        if self.source in ('cfr', 'table', 'terminal'):
+            return f"Answered from {self.source} in {self.elapsed_s * 1000:.2f} ms"
+        text = (f"{self.iterations} iterations, {self.elapsed_s * 1000:.1f} ms, "
+                f"top action {self.decisiveness:.0%} of visits")
+        if self.source == 'mcts':
+            text += (f", {self.nodes} nodes, depth {self.max_depth} (mean {self.mean_depth:.1f})"
+                     f"\nselect {self.selection_s * 1000:.1f} / expand {self.expansion_s * 1000:.1f} / "
+                     f"rollout {self.rollout_s * 1000:.1f} / backprop {self.backprop_s * 1000:.1f} ms")
+        return text
 
 class MCTS:
     """Monte Carlo Tree Search implementation for Zha Jin Hua"""
-    def __init__(self, score_calculator: ZhaJinHuaScoreCalculator):
+    CLOCK_CHECK_INTERVAL = 8
+
+    def __init__(self, score_calculator: ZhaJinHuaScoreCalculator,
+                 seed: Optional[int] = None, opponent_range: Optional[OpponentRange] = None):
+        """
+        With an opponent_range for the root state's round, simulated opponents act
+        according to the range and showdowns are valued against it instead of
+        against a uniformly random hand.
+        """
         self.score_calculator = score_calculator
+        # Private RNG stream so parallel searches never share random state
+        self.rng = random.Random(seed)
+        self.opponent_range = opponent_range
+        self.last_iterations = 0
+        self.last_stats: Optional[SearchStats] = None
+
+    def get_best_action(self, root_state: ZhaJinHuaState, iterations: int = 1000,
+                        deadline_ms: Optional[float] = None, return_stats: bool = False):
+        """
+        Best action for `root_state`. With return_stats, returns (action, SearchStats)
+        with the search's counters and per-phase timings; timing costs a few clock
+        reads per iteration, so it is only done when asked for.
+        """
+        stats = SearchStats() if return_stats else None
+        start = time.perf_counter() if stats is not None else 0.0
+        if root_state.is_terminal():
+            action = self.terminal_action(root_state)
+            if stats is not None:
+                stats.source = 'terminal'
+        else:
+            # Return best action based on highest visit count
+            action = self.select_action(self.search(root_state, iterations, deadline_ms, stats))
+        if stats is None:
+            return action
+        stats.elapsed_s = time.perf_counter() - start
+        self.last_stats = stats
+        return action, stats
+
+    def terminal_action(self, state: ZhaJinHuaState) -> str:
+        """
+        Action for a root the model already treats as terminal (e.g. a stack is all-in),
+        where there is nothing to search: call with positive showdown equity, else fold.
+        """
+        actions = state.get_possible_actions()
+        return actions[1] if self.showdown_value(state.player_hand) > 0 and len(actions) > 1 else 'fold'
 
-    def get_best_action(self, root_state: ZhaJinHuaState, iterations: int = 1000) -> str:
+    def search(self, root_state: ZhaJinHuaState, iterations: int = 1000,
+               deadline_ms: Optional[float] = None,
+               stats: Optional[SearchStats] = None) -> Dict[str, Tuple[float, float]]:
+        """
+        Run the search and return (visits, total value) for each root action.
+        With deadline_ms the search is anytime: it runs until that many milliseconds
+        have passed instead of for a fixed number of iterations. The number of
+        iterations actually completed is left in self.last_iterations.
+        A SearchStats passed as stats is filled in as the search runs.
+        """
         root = MCTSNode(root_state)
         
-        for _ in range(iterations):
-            node = root
-            state = deepcopy(root_state)
-            
-            # Selection
-            while not node.state.is_terminal() and node.is_fully_expanded():
-                node = node.best_child()
-                state = self.simulate_action(state, node.action)
-            
-            # Expansion
-            if not node.state.is_terminal() and not node.is_fully_expanded():
-                action = random.choice(node.untried_actions)
-                node.untried_actions.remove(action)
-                state = self.simulate_action(state, action)
-                node.children[action] = MCTSNode(state, node, action)
-                node = node.children[action]
-            
-            # Simulation
-            while not state.is_terminal():
-                possible_actions = state.get_possible_actions()
-                action = node.rollout_policy(possible_actions)
-                state = self.simulate_action(state, action)
-            
-            # Backpropagation
-            reward = self.calculate_reward(state)
-            while node is not None:
-                node.visits += 1
-                node.value += reward
-                node = node.parent
+        if deadline_ms is None:
+            for _ in range(iterations):
+                self.run_iteration(root, root_state, stats)
+            self.last_iterations = iterations
+        else:
+            # Only read the clock every CLOCK_CHECK_INTERVAL iterations
+            deadline = time.perf_counter() + deadline_ms / 1000
+            completed = 0
+            while True:
+                for _ in range(self.CLOCK_CHECK_INTERVAL):
+                    self.run_iteration(root, root_state, stats)
+                completed += self.CLOCK_CHECK_INTERVAL
+                if time.perf_counter() >= deadline:
+                    break
+            self.last_iterations = completed
+
+        root_stats = {action: (child.visits, child.value) for action, child in root.children.items()}
+        if stats is not None:
+            stats.iterations += self.last_iterations
+            stats.record_root(root_stats)
+        return root_stats
 
-        # Return best action based on highest visit count
-        return max(root.children.items(), key=lambda x: x[1].visits)[0]
+    def run_iteration(self, root: MCTSNode, root_state: ZhaJinHuaState,
+                      stats: Optional[SearchStats] = None) -> None:
+        """
+        One selection / expansion / rollout / backpropagation pass over the tree under `root`.
+        With stats, the phases are timed and the tree growth is counted.
+        """
+        node = root
+        # States are immutable, so every iteration can start from the root state itself
+        state = root_state
+        depth = 0
+        if stats is not None:
+            clock = time.perf_counter
+            t0 = clock()
+        
+        # Selection
+        while not node.state.is_terminal() and node.is_fully_expanded():
+            node = node.best_child()
+            state = self.simulate_action(state, node.action)
+            depth += 1
+        if stats is not None:
+            t1 = clock()
+        
+        # Expansion
+        if not node.state.is_terminal() and not node.is_fully_expanded():
+            action = self.rng.choice(node.untried_actions)
+            node.untried_actions.remove(action)
+            state = self.simulate_action(state, action)
+            node.children[action] = MCTSNode(state, node, action)
+            node = node.children[action]
+            depth += 1
+            if stats is not None:
+                stats.nodes += 1
+        if stats is not None:
+            t2 = clock()
+        
+        # Simulation
+        steps = 0
+        while not state.is_terminal():
+            possible_actions = state.get_possible_actions()
+            action = self.rollout_policy(possible_actions)
+            state = self.simulate_action(state, action)
+            steps += 1
+        if stats is not None:
+            t3 = clock()
+        
+        # Backpropagation
+        reward = self.calculate_reward(state)
+        while node is not None:
+            node.visits += 1
+            node.value += reward
+            node = node.parent
+        if stats is not None:
+            t4 = clock()
+            stats.selection_s += t1 - t0
+            stats.expansion_s += t2 - t1
+            stats.rollout_s += t3 - t2
+            stats.backprop_s += t4 - t3
+            stats.rollout_steps += steps
+            stats.total_depth += depth
+            stats.max_depth = max(stats.max_depth, depth)
+
+    def rollout_policy(self, possible_actions: List[str]) -> str:
+        """Random policy for rollout phase"""
+        return self.rng.choice(possible_actions)
+
+    @staticmethod
+    def select_action(root_stats: Dict[str, Tuple[float, float]]) -> str:
+        """Pick the root action with the highest visit count"""
+        return max(root_stats.items(), key=lambda x: x[1][0])[0]
 
     def simulate_action(self, state: ZhaJinHuaState, action: str) -> ZhaJinHuaState:
         """Simulates an action and returns new state"""
-        new_state = deepcopy(state)
-        
         if action == 'fold':
-            new_state.game_over = True
-            total_pot = new_state.player_bet + new_state.opponent_bet
-            if new_state.is_dealer:
-                new_state.opponent_coins += total_pot
-            else:
-                new_state.player_coins += total_pot
-            return new_state
+            total_pot = state.player_bet + state.opponent_bet
+            if state.is_dealer:
+                return state._replace(game_over=True, opponent_coins=state.opponent_coins + total_pot)
+            return state._replace(game_over=True, player_coins=state.player_coins + total_pot)
             
         elif action.startswith('bet'):
             bet_amount = int(action[3])
-            min_bet = max(new_state.opponent_bet - new_state.player_bet, 1)
+            min_bet = max(state.opponent_bet - state.player_bet, 1)
             bet_amount = max(bet_amount, min_bet)
             
-            if new_state.player_coins >= bet_amount:
-                new_state.player_bet += bet_amount
-                new_state.player_coins -= bet_amount
+            if state.player_coins >= bet_amount:
+                state = state._replace(player_bet=state.player_bet + bet_amount,
+                                       player_coins=state.player_coins - bet_amount)
                 
                 # Simulate opponent response
-                if not new_state.is_terminal():
-                    self.simulate_opponent_action(new_state)
+                if not state.is_terminal():
+                    state = self.simulate_opponent_action(state)
                     
-        return new_state
+        return state
 
-    def simulate_opponent_action(self, state: ZhaJinHuaState) -> None:
-        """Simulates opponent's action"""
-        action = random.choice(['fold', 'bet1', 'bet2'])
+    def simulate_opponent_action(self, state: ZhaJinHuaState) -> ZhaJinHuaState:
+        """Simulates opponent's action and returns new state"""
+        if self.opponent_range is None:
+            action = self.rng.choice(['fold', 'bet1', 'bet2'])
+        else:
+            fold, bet1 = self.opponent_range.response_thresholds()
+            draw = self.rng.random()
+            action = 'fold' if draw < fold else 'bet1' if draw < bet1 else 'bet2'
         
         if action == 'fold':
-            state.game_over = True
             total_pot = state.player_bet + state.opponent_bet
-            state.player_coins += total_pot
-        else:
-            bet_amount = 1 if action == 'bet1' else 2
-            min_bet = max(state.player_bet - state.opponent_bet, 1)
-            bet_amount = max(bet_amount, min_bet)
-            
-            if state.opponent_coins >= bet_amount:
-                state.opponent_bet += bet_amount
-                state.opponent_coins -= bet_amount
+            return state._replace(game_over=True, player_coins=state.player_coins + total_pot)
+
+        bet_amount = 1 if action == 'bet1' else 2
+        min_bet = max(state.player_bet - state.opponent_bet, 1)
+        bet_amount = max(bet_amount, min_bet)
+        
+        if state.opponent_coins >= bet_amount:
+            return state._replace(opponent_bet=state.opponent_bet + bet_amount,
+                                  opponent_coins=state.opponent_coins - bet_amount)
+        return state
 
     def calculate_reward(self, state: ZhaJinHuaState) -> float:
         """Calculate reward for terminal state"""
         if state.game_over:
             return 1.0 if state.player_coins > state.opponent_coins else -1.0
             
-        # If we reach showdown, compare hands
-        player_score = self.score_calculator.calculate_score(state.player_hand)
-        # For opponent's unknown cards, we use average score from possible hands
-        avg_opponent_score = self.estimate_opponent_average_score()
-        
-        # Compare hand types first (first element of the tuple)
-        if player_score[0] > 3.5:  # If player has better than a pair
-            return 1.0
-        elif player_score[0] < 3.5:  # If player has worse than a pair
-            return -1.0
-        else:  # If hands are equal type, compare high cards
-            # Normalize the high card value to a probability
-            return (player_score[1] - 7) / 7  # Will give value between -1 and 1
-
-    def estimate_opponent_average_score(self) -> float:
-        """Estimates average score of opponent's possible hands"""
-        # Returns 3.5 as baseline (between pair and straight)
-        return 3.5
+        if self.opponent_range is not None:
+            return self.range_value(state)
+        # If we reach showdown, use exact equity against every possible opponent hand
+        return self.showdown_value(state.player_hand)
+
+    def showdown_value(self, hand: List[Card]) -> float:
+        """Win - loss showdown equity; hands outside the 3-card table get the hand-type reward"""
+        try:
+            win, _, loss = self.showdown_equity(hand)
+        except ValueError:
+            return self.hand_type_reward(hand)
+        return win - loss
+
+    def hand_type_reward(self, hand: List[Card]) -> float:
+        """
+        Reward used before the equity engine, kept for hands it can't index
+        (jokers, duplicate card art): better than a pair wins, anything else loses.
+        """
+        type_value, _ = self.score_calculator.calculate_score(hand)
+        return 1.0 if type_value > PAIR else -1.0
+
+    def range_value(self, state: ZhaJinHuaState) -> float:
+        """
+        Showdown equity against the opponent range, conditioned on the bet the
+        simulated opponent made since the range's last observation, if any.
+        """
+        opponent_range = self.opponent_range
+        amount = state.opponent_bet - opponent_range.observed_bet
+        if amount <= 0:
+            return opponent_range.value()
+        # Our bet has not changed since the opponent answered it
+        return opponent_range.value_after(amount, max(state.player_bet - opponent_range.observed_bet, 1))
+
+    @staticmethod
+    def showdown_equity(hand: List[Card]) -> Tuple[float, float, float]:
+        """(win, tie, loss) probabilities at showdown, cached per hand"""
+        return showdown_equity(hand)
     
+def root_parallel_search(root_state: ZhaJinHuaState, iterations: int, seed: int,
+                         deadline_ms: Optional[float] = None,
+                         opponent_range: Optional[OpponentRange] = None
+                         ) -> Tuple[Dict[str, Tuple[float, float]], int]:
+    """
+    Worker entry point: one independent MCTS search with its own RNG stream.
+    Returns the root statistics and the number of iterations completed.
+    """
+    mcts = MCTS(ZhaJinHuaScoreCalculator(), seed=seed, opponent_range=opponent_range)
+    stats = mcts.search(root_state, iterations, deadline_ms)
+    return stats, mcts.last_iterations
+
+def merge_root_stats(results: List[Dict[str, Tuple[float, float]]]) -> Dict[str, Tuple[float, float]]:
+    """Sum root child visits and values across independent searches"""
+    merged: Dict[str, Tuple[float, float]] = {}
+    for stats in results:
+        for action, (visits, value) in stats.items():
+            total_visits, total_value = merged.get(action, (0.0, 0.0))
+            merged[action] = (total_visits + visits, total_value + value)
+    return merged
+
 class ZhaJinHuaAI:
     """AI advisor for Zha Jin Hua game"""
-    def __init__(self, score_calculator: ZhaJinHuaScoreCalculator):
+    def __init__(self, score_calculator: ZhaJinHuaScoreCalculator, workers: int = 1,
+                 iterations: int = 500, seed: Optional[int] = None,
+                 deadline_ms: Optional[float] = None,
+                 policy: Optional[CFRPolicy] = None,
+                 policy_table: Union[str, PolicyTable, None] = None,
+                 track_range: bool = False, profile: bool = False):
+        """
+        workers > 1 enables root parallelism: that many independent searches of
+        `iterations` each run in a persistent process pool and their root
+        statistics are merged before choosing the action.
+        deadline_ms replaces the iteration budget with a time budget per suggestion.
+        With a policy (see cfr_solver), decisions the table covers are sampled from the
+        precomputed equilibrium instead of searched; anything else falls back to MCTS.
+        policy_table is a file written by policy_table.build_table (or a loaded PolicyTable):
+        it is memory-mapped once here and answers covered states with a single lookup.
+        track_range keeps an OpponentRange for the round, narrowed by the opponent's
+        bets seen in the states asked about, and searches against it. It takes
+        priority over policy and policy_table: those are precomputed against a fixed
+        opponent and can't use the range, so they are not consulted while it is tracked.
+        profile makes get_suggestion collect search statistics, log them and add a
+        summary line to the suggestion; without it no timing is done.
+        """
         self.score_calculator = score_calculator
-        self.mcts = MCTS(score_calculator)
+        self.mcts = MCTS(score_calculator, seed=seed)
+        self.workers = workers
+        self.iterations = iterations
+        self.deadline_ms = deadline_ms
+        self.last_iterations = 0  # Iterations completed by the latest search, over all workers
+        self.last_stats: Optional[SearchStats] = None  # Statistics of the latest get_best_action(return_stats=True)
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.policy = policy
+        if isinstance(policy_table, str):
+            policy_table = PolicyTable(policy_table)
+        self.policy_table = policy_table
+        self.track_range = track_range
+        self.opponent_range: Optional[OpponentRange] = None
+        self.profile = profile
+
+    def get_best_action(self, state: ZhaJinHuaState, return_stats: bool = False):
+        """
+        Best action for `state`, searching in parallel when workers > 1.
+        With return_stats, returns (action, SearchStats); parallel searches report
+        iterations and the merged root visits but no per-phase timings.
+        """
+        start = time.perf_counter() if return_stats else 0.0
+        action, stats = self._best_action(state, return_stats)
+        if not return_stats:
+            return action
+        stats.elapsed_s = time.perf_counter() - start
+        self.last_stats = stats
+        return action, stats
+
+    def observe(self, state: ZhaJinHuaState) -> None:
+        """
+        Bring the opponent range up to date with `state`: a new hand or smaller
+        opponent bet starts a new round's range, and a larger opponent bet is
+        observed once. Does nothing unless track_range is set.
+        """
+        if not self.track_range or state.game_over:
+            return
+        index = lookup_index(state.player_hand)
+        if index is None:
+            # No range over a hand the table can't index; search against a random opponent
+            self.opponent_range = self.mcts.opponent_range = None
+            return
+        opponent_range = self.opponent_range
+        if (opponent_range is None or opponent_range.hand != index
+                or state.opponent_bet < opponent_range.observed_bet):
+            # A new round: start again from the uniform range. A fresh object, so a
+            # search still running against the old one is not affected.
+            opponent_range = self.opponent_range = OpponentRange(state.player_hand)
+        amount = state.opponent_bet - opponent_range.observed_bet
+        if amount > 0:
+            # The opponent answered our bet of state.player_bet, or opened the round
+            opponent_range.observe(amount, max(state.player_bet - opponent_range.observed_bet, 1))
+        self.mcts.opponent_range = opponent_range
+
+    def _best_action(self, state: ZhaJinHuaState, return_stats: bool) -> Tuple[str, Optional[SearchStats]]:
+        self.observe(state)
+        if self.policy is not None and not self.track_range:
+            action = self.policy.get_action(state, self.mcts.rng)
+            if action is not None:
+                self.last_iterations = 0
+                return action, SearchStats('cfr') if return_stats else None
+        if self.policy_table is not None and not self.track_range:
+            action = self.policy_table.get_action(state)
+            if action is not None:
+                self.last_iterations = 0
+                return action, SearchStats('table') if return_stats else None
+        if self.workers <= 1 or state.is_terminal():
+            result = self.mcts.get_best_action(state, iterations=self.iterations,
+                                               deadline_ms=self.deadline_ms, return_stats=return_stats)
+            self.last_iterations = self.mcts.last_iterations
+            return result if return_stats else (result, None)
+
+        if self.pool is None:
+            # Created once and reused, so worker start-up is paid only on the first call
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        seeds = [int(child.generate_state(1)[0]) for child in self.seed_sequence.spawn(self.workers)]
+        futures = [self.pool.submit(root_parallel_search, state, self.iterations, seed,
+                                    self.deadline_ms, self.opponent_range)
+                   for seed in seeds]
+        results = [future.result() for future in futures]
+        self.last_iterations = sum(iterations for _, iterations in results)
+        merged = merge_root_stats([stats for stats, _ in results])
+        stats = None
+        if return_stats:
+            stats = SearchStats('parallel')
+            stats.iterations = self.last_iterations
+            stats.record_root(merged)
+        return MCTS.select_action(merged), stats
+
+    def new_round(self) -> None:
+        """Drop the opponent range kept from the previous round"""
+        self.opponent_range = None
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
 
     def get_suggestion(self, state: ZhaJinHuaState) -> str:
         """Gets AI suggestion for the current game state"""
         # Get best action using MCTS
-        best_action = self.mcts.get_best_action(state, iterations=500)
+        stats = None
+        if self.profile:
+            best_action, stats = self.get_best_action(state, return_stats=True)
+            logger.debug("Search statistics: %s", stats.as_dict())
+        else:
+            best_action = self.get_best_action(state)
 
         # Generate suggestion message
         player_score = self.score_calculator.calculate_score(state.player_hand)
@@ -281,6 +560,8 @@ class ZhaJinHuaAI:
         suggestion_msg += f"Hand strength: {self.get_hand_strength(player_score)}\n"
         suggestion_msg += f"Suggested action: {self.format_action(best_action)}\n"
         suggestion_msg += self.get_action_explanation(best_action, player_score)
+        if stats is not None:
+            suggestion_msg += f"\nSearch: {stats.summary()}"
 
         return suggestion_msg
 
@@ -0,0 +1,152 @@
+"""
+Lockstep NumPy simulator for the abstract strategy-vs-strategy game used by
+zhajinhua_visulization.py and zhajinhua_visulization_agent.py.
+
+Every game in a batch advances one round per step as array operations; games
+that have finished are dropped from the working arrays, so the cost per round
+shrinks as the batch resolves. Strategies are given as probability tables
+indexed by [coins, hand_strength, action].
+"""
+from typing import NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from cards import ACTION_IDS, ACTIONS
+
+FOLD, BET1, BET2 = (ACTION_IDS[action] for action in ACTIONS)
+NUM_HAND_STRENGTHS = 11  # Hand strength is uniform on 0..10
+
+
+class Rules(NamedTuple):
+    """How a round is settled and how a game is scored"""
+    fold_pays_pot: bool     # A fold hands the pot to the other player (otherwise the pot is lost)
+    cap_opponent_bet: bool  # The opponent can't bet more coins than it has
+    outcome: str            # 'bust': a player wins only by emptying the other's stack; 'stack': more coins wins
+
+
+# simulate_round in zhajinhua_visulization.py
+MATRIX_RULES = Rules(fold_pays_pot=False, cap_opponent_bet=False, outcome='bust')
+# simulate_round in zhajinhua_visulization_agent.py
+AGENT_RULES = Rules(fold_pays_pot=True, cap_opponent_bet=True, outcome='stack')
+
+
+def uniform_table(max_coins: int) -> np.ndarray:
+    """Table of a strategy that picks fold, bet1 and bet2 with equal probability"""
+    return np.full((max_coins + 1, NUM_HAND_STRENGTHS, len(ACTIONS)), 1 / len(ACTIONS))
+
+
+def mix_tables(first: np.ndarray, second: np.ndarray, weight: Union[float, np.ndarray]) -> np.ndarray:
+    """Play `first` with probability `weight` (a scalar or one value per coin count), else `second`"""
+    weight = np.asarray(weight, dtype=np.float64).reshape(-1, 1, 1)
+    return weight * first + (1 - weight) * second
+
+
+def sample_actions(cumulative: np.ndarray, coins: np.ndarray, hands: np.ndarray,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Draw one action per game from a cumulative probability table"""
+    rows = cumulative[np.clip(coins, 0, cumulative.shape[0] - 1), hands]
+    u = rng.random(coins.size)
+    return (u >= rows[:, 0]).astype(np.int64) + (u >= rows[:, 1])
+
+
+def tally_outcomes(player_coins: np.ndarray, opponent_coins: np.ndarray, rules: Rules) -> np.ndarray:
+    """[player wins, opponent wins, draws] for finished games"""
+    if rules.outcome == 'bust':
+        player = (player_coins > 0) & (opponent_coins == 0)
+        opponent = (opponent_coins > 0) & (player_coins == 0)
+    else:
+        player = player_coins > opponent_coins
+        opponent = opponent_coins > player_coins
+    player_wins = int(np.count_nonzero(player))
+    opponent_wins = int(np.count_nonzero(opponent))
+    return np.array([player_wins, opponent_wins, player_coins.size - player_wins - opponent_wins])
+
+
+def simulate_games_batch(player_table: np.ndarray, opponent_table: np.ndarray, num_games: int,
+                         rules: Rules = MATRIX_RULES, starting_coins: int = 5, max_rounds: int = 1000,
+                         rng: Optional[np.random.Generator] = None) -> Tuple[int, int, int]:
+    """
+    Play `num_games` independent games in lockstep.
+    Returns the number of player wins, opponent wins and draws.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    player_cum = np.cumsum(player_table, axis=-1)
+    opponent_cum = np.cumsum(opponent_table, axis=-1)
+    player_coins = np.full(num_games, starting_coins, dtype=np.int64)
+    opponent_coins = np.full(num_games, starting_coins, dtype=np.int64)
+    totals = np.zeros(3, dtype=np.int64)
+
+    for _ in range(max_rounds):
+        if player_coins.size == 0:
+            break
+        # Deal hands
+        player_hand = rng.integers(0, NUM_HAND_STRENGTHS, player_coins.size)
+        opponent_hand = rng.integers(0, NUM_HAND_STRENGTHS, player_coins.size)
+
+        # Decide actions based on strategies and hands
+        player_action = sample_actions(player_cum, player_coins, player_hand, rng)
+        opponent_action = sample_actions(opponent_cum, opponent_coins, opponent_hand, rng)
+
+        # Action id doubles as the bet size; short stacks bet what they have
+        player_bet = np.minimum(player_action, player_coins)
+        opponent_bet = np.minimum(opponent_action, opponent_coins) if rules.cap_opponent_bet else opponent_action
+        player_coins -= player_bet
+        opponent_coins -= opponent_bet
+        pot = player_bet + opponent_bet
+
+        player_fold = player_action == FOLD
+        opponent_fold = opponent_action == FOLD
+        if rules.fold_pays_pot:
+            opponent_coins += np.where(player_fold, pot, 0)
+            player_coins += np.where(~player_fold & opponent_fold, pot, 0)
+
+        # Both bet: compare hands, ties return bets
+        showdown = ~player_fold & ~opponent_fold
+        tie = showdown & (player_hand == opponent_hand)
+        player_coins += np.where(showdown & (player_hand > opponent_hand), pot, 0) + np.where(tie, player_bet, 0)
+        opponent_coins += np.where(showdown & (opponent_hand > player_hand), pot, 0) + np.where(tie, opponent_bet, 0)
+
+        finished = (player_coins <= 0) | (opponent_coins <= 0)
+        if finished.any():
+            totals += tally_outcomes(player_coins[finished], opponent_coins[finished], rules)
+            running = ~finished
+            player_coins = player_coins[running]
+            opponent_coins = opponent_coins[running]
+
+    # Games still running hit max_rounds
+    totals += tally_outcomes(player_coins, opponent_coins, rules)
+    return int(totals[0]), int(totals[1]), int(totals[2])
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion (95% for the default z)"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half_width = z * float(np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials))) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def simulate_games_adaptive(player_table: np.ndarray, opponent_table: np.ndarray, rules: Rules = MATRIX_RULES,
+                            target_width: float = 0.02, chunk_size: int = 500, max_games: int = 100000,
+                            starting_coins: int = 5, max_rounds: int = 1000, z: float = 1.96,
+                            rng: Optional[np.random.Generator] = None) -> Tuple[Tuple[int, int, int], int]:
+    """
+    Play chunks of `chunk_size` games until the Wilson interval of the player's
+    win rate is at most `target_width` wide, or `max_games` have been played.
+    Returns the (player wins, opponent wins, draws) tally and the number of games.
+    Lopsided matchups stop after a chunk or two; close ones use the full budget.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    totals = np.zeros(3, dtype=np.int64)
+    games = 0
+    while games < max_games:
+        size = min(chunk_size, max_games - games)
+        totals += simulate_games_batch(player_table, opponent_table, size, rules, starting_coins, max_rounds, rng)
+        games += size
+        low, high = wilson_interval(int(totals[0]), games, z)
+        if high - low <= target_width:
+            break
+    return (int(totals[0]), int(totals[1]), int(totals[2])), games
@@ -0,0 +1,267 @@
+"""
+Benchmarks for the project's hot paths.
+
+Runs without a display: card rendering uses a real Tk root when one can be
+opened and otherwise a stub that stands in for the Tk widgets and PhotoImage,
+so the measured work is the GUI code itself (cache lookups and label updates).
+
+Results are written as JSON and compared against a stored baseline; any metric
+that regresses by more than the threshold makes the run exit with status 1.
+
+    python benchmark.py                     # run and compare with benchmark_baseline.json
+    python benchmark.py --update-baseline   # run and store the results as the new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import types
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from cards import HANDS
+from MCTS_agent import MCTS, ZhaJinHuaScoreCalculator, ZhaJinHuaState
+from zhajinhua_engine import ZhaJinHuaSimulator
+
+BASELINE_PATH = 'benchmark_baseline.json'
+DEFAULT_THRESHOLD = 0.25
+
+# Metric name -> True if higher is better
+METRICS = {
+    'score_hands_per_s': True,
+    'mcts_iterations_per_s': True,
+    'mcts_latency_p50_ms': False,
+    'mcts_latency_p99_ms': False,
+    'simulate_game_games_per_s': True,
+    'simulate_multiple_games_batched_games_per_s': True,
+    'deal_hands_per_s': True,
+    'display_hand_renders_per_s': True,
+}
+
+
+def rate(function: Callable[[], None], repeats: int, rounds: int = 5) -> float:
+    """
+    Calls per second of `function`, from the fastest of `rounds` rounds of
+    `repeats` calls each; like timeit, the best round is the least disturbed by other load.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return repeats / best
+
+
+def random_states(count: int, rng: random.Random) -> List[ZhaJinHuaState]:
+    """Decision states the GUI asks the AI about: fresh rounds and facing a bet"""
+    states = []
+    while len(states) < count:
+        player_coins = rng.randint(1, 9)
+        state = ZhaJinHuaState(list(HANDS[rng.randrange(len(HANDS))]), player_coins,
+                               rng.randint(1, 10 - player_coins), 0, rng.choice((0, 1, 2)),
+                               rng.random() < 0.5)
+        if not state.is_terminal():
+            states.append(state)
+    return states
+
+
+def bench_score(quick: bool) -> Dict[str, float]:
+    calculator = ZhaJinHuaScoreCalculator()
+    hands = [list(HANDS[i]) for i in np.random.default_rng(0).integers(0, len(HANDS), 1000)]
+    repeats = 5 if quick else 40
+
+    def score_all():
+        for hand in hands:
+            calculator.calculate_score(hand)
+
+    return {'score_hands_per_s': rate(score_all, repeats) * len(hands)}
+
+
+def bench_mcts(quick: bool) -> Dict[str, float]:
+    iterations = 500
+    states = random_states(20 if quick else 100, random.Random(0))
+    mcts = MCTS(ZhaJinHuaScoreCalculator(), seed=0)
+    latencies = []
+    for state in states:
+        start = time.perf_counter()
+        mcts.get_best_action(state, iterations=iterations)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    return {
+        'mcts_iterations_per_s': iterations * len(states) / latencies.sum(),
+        'mcts_latency_p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'mcts_latency_p99_ms': float(np.percentile(latencies, 99) * 1000),
+    }
+
+
+def bench_simulation(quick: bool) -> Dict[str, float]:
+    import zhajinhua_visulization as matrix
+
+    random.seed(0)
+    scalar_games = 100 if quick else 1000
+    batched_games = 10000 if quick else 50000
+    scalar = rate(lambda: matrix.simulate_game('Moderate', 'Aggressive'), scalar_games)
+    rng = np.random.default_rng(0)
+    batched = rate(lambda: matrix.simulate_multiple_games('Moderate', 'Aggressive', batched_games,
+                                                          batched=True, rng=rng), 1) * batched_games
+    return {'simulate_game_games_per_s': scalar, 'simulate_multiple_games_batched_games_per_s': batched}
+
+
+def bench_deal(quick: bool) -> Dict[str, float]:
+    simulator = ZhaJinHuaSimulator(random.Random(0))
+    return {'deal_hands_per_s': rate(simulator.deal_hands, 2000 if quick else 20000)}
+
+
+class _StubPhoto:
+    """Stands in for ImageTk.PhotoImage: keeps the decoded PIL image"""
+    def __init__(self, image):
+        self.image = image
+
+
+class _StubWidget:
+    """Just enough of a Tk widget for display_hand"""
+    def __init__(self, master=None, **options):
+        self.children: List['_StubWidget'] = []
+        self.options = options
+        if master is not None:
+            master.children.append(self)
+        self.master = master
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def destroy(self):
+        if self.master is not None:
+            self.master.children.remove(self)
+
+    def pack(self, **options):
+        pass
+
+    def config(self, **options):
+        self.options.update(options)
+
+
+def bench_display_hand(quick: bool) -> Dict[str, float]:
+    import zhajinhua_simulator as gui_module
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        root = None
+
+    saved = gui_module.tk, gui_module.ImageTk.PhotoImage
+    if root is None:
+        gui_module.tk = types.SimpleNamespace(Label=_StubWidget)
+        gui_module.ImageTk.PhotoImage = _StubPhoto
+        frame = _StubWidget()
+    else:
+        frame = tk.Frame(root)
+    try:
+        # A stand-in GUI object carrying only what display_hand uses
+        gui = types.SimpleNamespace(card_images=gui_module.CardImageCache())
+        # Warm the cache in this thread (no background preload competing for the GIL),
+        # so the measurement is the per-deal cost, not the first decode
+        for card in [*gui_module.DECK, gui_module.CARD_BACK_PATH]:
+            gui.card_images.get(card)
+        simulator = ZhaJinHuaSimulator(random.Random(0))
+        hands = [list(simulator.deal_hands()[0]) for _ in range(50)]
+        count = 0
+
+        def render():
+            nonlocal count
+            gui_module.ZhaJinHuaGUI.display_hand(gui, frame, hands[count % len(hands)])
+            gui_module.ZhaJinHuaGUI.display_hand(gui, frame, [gui_module.CARD_BACK_PATH] * 3)
+            count += 1
+
+        renders = rate(render, 100 if quick else 1000) * 2
+    finally:
+        gui_module.tk, gui_module.ImageTk.PhotoImage = saved
+        if root is not None:
+            root.destroy()
+    return {'display_hand_renders_per_s': renders}
+
+
+BENCHMARKS = {
+    'score': bench_score,
+    'mcts': bench_mcts,
+    'simulation': bench_simulation,
+    'deal': bench_deal,
+    'display_hand': bench_display_hand,
+}
+
+
+def run_benchmarks(names: Optional[List[str]] = None, quick: bool = False) -> Dict[str, float]:
+    results = {}
+    for name in names or BENCHMARKS:
+        results.update(BENCHMARKS[name](quick))
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Descriptions of the metrics that regressed by more than `threshold` against the baseline"""
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+        if METRICS[name]:
+            regressed = value < reference * (1 - threshold)
+        else:
+            regressed = value > reference * (1 + threshold)
+        if regressed:
+            regressions.append(f"{name}: {value:.4g} vs baseline {reference:.4g}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths and compare with a baseline.")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument('--quick', action='store_true', help="smaller workloads, for a fast smoke run")
+    parser.add_argument('--output', help="write the results JSON here (default: stdout only)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative regression per metric (default: 0.25)")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.quick)
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'quick': args.quick,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('quick') != args.quick:
+        print("Note: the baseline was recorded with a different --quick setting", file=sys.stderr)
+    regressions = compare(results, baseline['results'], args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import os
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+# Integer card model: card = (rank - 2) * 4 + suit, so 0..51 with 2 of clubs = 0
+# and ace of spades = 51. Ranks run 2..14 (ace high).
+SUITS = ('clubs', 'diamonds', 'hearts', 'spades')
+RANK_NAMES = {
+    'ace': 14, 'king': 13, 'queen': 12, 'jack': 11,
+    '10': 10, '9': 9, '8': 8, '7': 7,
+    '6': 6, '5': 5, '4': 4, '3': 3, '2': 2
+}
+NUM_CARDS = 52
+NUM_HANDS = 22100  # C(52, 3)
+
+# Hand type ranks, shared by the GUI and the MCTS agent
+THREE_OF_A_KIND = 7  # 豹子
+STRAIGHT_FLUSH = 6   # 同花顺
+FLUSH = 5            # 同花
+STRAIGHT = 4         # 顺子
+PAIR = 3             # 对子
+HIGH_CARD = 2        # 单张
+
+# Betting actions and their ids, shared by the agent and the solvers.
+# An action's id doubles as the coins it asks to bet.
+ACTIONS = ('fold', 'bet1', 'bet2')
+ACTION_IDS = {action: i for i, action in enumerate(ACTIONS)}
+NUM_ACTIONS = len(ACTIONS)
+
+Card = Union[int, str]
+
+
+def make_card(rank: int, suit: int) -> int:
+    """Encode a rank (2..14) and suit index (0..3) as a card id"""
+    return (rank - 2) * 4 + suit
+
+
+def card_rank(card: int) -> int:
+    """Rank of a card id, 2..14"""
+    return (card >> 2) + 2
+
+
+def card_suit(card: int) -> int:
+    """Suit index of a card id, 0..3"""
+    return card & 3
+
+
+@lru_cache(maxsize=None)
+def parse_card(card_path: str) -> Optional[int]:
+    """
+    Parse a card image path like "PNG-cards-1.3/2_of_hearts.png" into a card id.
+    The alternate "*2.png" face-card art maps to the same card; jokers and
+    anything unrecognised return None.
+    """
+    name = os.path.basename(card_path).split('.')[0]
+    parts = name.split('_')
+    if len(parts) != 3 or parts[1] != 'of':
+        return None
+    rank = RANK_NAMES.get(parts[0].lower())
+    suit = parts[2].lower().rstrip('2')
+    if rank is None or suit not in SUITS:
+        return None
+    return make_card(rank, SUITS.index(suit))
+
+
+def encode_hand(hand: Iterable[Card]) -> Optional[Tuple[int, ...]]:
+    """Convert a hand of card ids and/or image paths to card ids, or None if any card is unknown"""
+    cards = []
+    for card in hand:
+        if not isinstance(card, int):
+            card = parse_card(card)
+            if card is None:
+                return None
+        cards.append(card)
+    return tuple(cards)
+
+
+# Colexicographic index of a sorted 3-card hand a < b < c:
+# C(a, 1) + C(b, 2) + C(c, 3), dense over 0..22099
+_C2 = [b * (b - 1) // 2 for b in range(NUM_CARDS)]
+_C3 = [c * (c - 1) * (c - 2) // 6 for c in range(NUM_CARDS)]
+
+
+def hand_index(a: int, b: int, c: int) -> int:
+    """Index of a 3-card hand into the lookup tables; cards may be in any order"""
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b, c = c, b
+        if a > b:
+            a, b = b, a
+    return a + _C2[b] + _C3[c]
+
+
+def classify(values: Sequence[int], suits: Sequence) -> Tuple[int, ...]:
+    """
+    Full comparison key for a hand given its ranks and suits.
+    The first two entries are (hand_type_rank, high_card_value); the rest break ties.
+    """
+    values = sorted(values, reverse=True)
+    distinct = set(values)
+
+    if len(distinct) == 1:
+        return (THREE_OF_A_KIND, values[0])
+
+    is_flush = len(set(suits)) == 1
+
+    # Ace-2-3 is the lowest straight, ranked by its 3
+    straight_value = 0
+    if distinct == {14, 2, 3}:
+        straight_value = 3
+    elif len(distinct) == 3 and values[0] - values[-1] == 2:
+        straight_value = values[0]
+
+    if straight_value and is_flush:
+        return (STRAIGHT_FLUSH, straight_value)
+    if is_flush:
+        return (FLUSH,) + tuple(values)
+    if straight_value:
+        return (STRAIGHT, straight_value)
+    if len(distinct) == 2 and len(values) == 3:
+        pair = values[1]  # The middle card always belongs to the pair
+        kicker = values[0] if values[0] != pair else values[2]
+        return (PAIR, pair, kicker)
+    return (HIGH_CARD,) + tuple(values)
+
+
+def _build_tables() -> Tuple[List[Tuple[int, ...]], List[int], List[Tuple[int, int]], List[Tuple[int, ...]]]:
+    hands = [None] * NUM_HANDS
+    keys = [None] * NUM_HANDS
+    for hand in combinations(range(NUM_CARDS), 3):
+        idx = hand_index(*hand)
+        hands[idx] = hand
+        keys[idx] = classify([card_rank(c) for c in hand], [card_suit(c) for c in hand])
+
+    # Dense strength ordinal: 0 is the weakest hand, equal hands share an ordinal
+    sorted_keys = sorted(set(keys))
+    ordinal_of = {key: i for i, key in enumerate(sorted_keys)}
+    ordinals = [ordinal_of[key] for key in keys]
+    scores = [key[:2] for key in keys]
+    return hands, ordinals, scores, sorted_keys
+
+
+# HANDS[i] is the sorted card tuple for hand index i, HAND_ORDINALS[i] its strength
+# ordinal with full kicker tie-breaking and HAND_SCORES[i] its (type, high card) score
+HANDS, HAND_ORDINALS, HAND_SCORES, _SORTED_KEYS = _build_tables()
+NUM_ORDINALS = len(_SORTED_KEYS)
+
+
+def _fallback_key(hand: Iterable[Card]) -> Optional[Tuple[int, ...]]:
+    """Comparison key for hands outside the table (jokers, duplicate art, wrong size)"""
+    values, suits = [], []
+    for card in hand:
+        if isinstance(card, int):
+            values.append(card_rank(card))
+            suits.append(card_suit(card))
+            continue
+        name = os.path.basename(card).split('.')[0]
+        parts = name.split('_')
+        rank = parts[0].lower()
+        values.append(RANK_NAMES.get(rank, int(rank) if rank.isdigit() else 0))
+        suits.append(parts[-1].rstrip('2'))
+    if not values:
+        return None
+    return classify(values, suits)
+
+
+def lookup_index(hand: Iterable[Card]) -> Optional[int]:
+    """Table index for a hand, or None if it is not three distinct known cards"""
+    cards = encode_hand(hand)
+    if cards is None or len(cards) != 3 or len(set(cards)) != 3:
+        return None
+    return hand_index(*cards)
+
+
+def hand_score(hand: Iterable[Card]) -> Tuple[int, int]:
+    """(hand_type_rank, high_card_value) for a hand"""
+    hand = list(hand)
+    idx = lookup_index(hand)
+    if idx is not None:
+        return HAND_SCORES[idx]
+    key = _fallback_key(hand)
+    if key is None:
+        return HIGH_CARD, 2  # Lowest possible score
+    return key[:2]
+
+
+def hand_ordinal(hand: Iterable[Card]) -> int:
+    """Strength ordinal of a hand; a higher ordinal beats a lower one, equal ordinals tie"""
+    hand = list(hand)
+    idx = lookup_index(hand)
+    if idx is not None:
+        return HAND_ORDINALS[idx]
+    key = _fallback_key(hand)
+    if key is None:
+        return 0
+    return max(bisect_right(_SORTED_KEYS, key) - 1, 0)
+
+
+# Canonical deck, built once. Image paths are only needed at the rendering edge.
+DECK = tuple(range(NUM_CARDS))
+DECK_PATH = "./PNG-cards-1.3/"
+_RANK_FILE_NAMES = {14: 'ace', 13: 'king', 12: 'queen', 11: 'jack'}
+
+
+def card_name(card: int) -> str:
+    """File stem for a card id, e.g. "queen_of_hearts" """
+    rank = card_rank(card)
+    return f"{_RANK_FILE_NAMES.get(rank, str(rank))}_of_{SUITS[card_suit(card)]}"
+
+
+CARD_IMAGE_PATHS = tuple(os.path.join(DECK_PATH, card_name(card) + ".png") for card in DECK)
+
+
+def card_image_path(card: Card) -> str:
+    """Image path for a card id; paths are passed through unchanged"""
+    if isinstance(card, int):
+        return CARD_IMAGE_PATHS[card]
+    return card
@@ -0,0 +1,244 @@
+"""
+CFR+ solver for the one-round Zha Jin Hua betting game.
+
+The round modelled by ZhaJinHuaState and zhajinhua_engine is tiny: the dealer
+folds or bets 1-2 coins, then the other seat folds, calls or raises and the
+hands are compared. A fold pays the pot to the other seat, and a bet a seat
+can't cover is not allowed. Abstractions:
+
+- Hands are grouped into equal-mass buckets by strength ordinal. Bucket
+  matchups use the ordinal distributions as if the two hands were independent,
+  which ignores the few cards one hand removes from the other's range.
+- Stacks only matter through which bets are affordable, so each seat's coins
+  are capped at 2.
+
+Each stack combination is solved with vectorised CFR+ (regret matching+,
+alternating updates, linearly weighted averaging). The averaged strategies
+form a CFRPolicy: an approximate Nash equilibrium table that answers
+in a couple of array lookups.
+"""
+import random
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from cards import ACTIONS, ACTION_IDS, NUM_ACTIONS, NUM_ORDINALS, hand_ordinal
+from equity import HAND_STRENGTHS
+
+FOLD, BET1, BET2 = (ACTION_IDS[action] for action in ACTIONS)
+MAX_COINS = 2  # Coins above this never change which bets are legal
+DEFAULT_BUCKETS = 20
+
+
+def ordinal_buckets(num_buckets: int) -> np.ndarray:
+    """Bucket of every strength ordinal, so that each bucket holds about the same share of hands"""
+    counts = np.bincount(HAND_STRENGTHS, minlength=NUM_ORDINALS)
+    midpoints = (np.cumsum(counts) - counts / 2) / counts.sum()
+    return np.minimum((midpoints * num_buckets).astype(np.int64), num_buckets - 1)
+
+
+def bucket_showdowns(buckets: np.ndarray, num_buckets: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bucket probabilities and P(first bucket wins) / P(first bucket loses) for
+    every bucket pair, treating the two hands as independent draws.
+    """
+    counts = np.bincount(HAND_STRENGTHS, minlength=NUM_ORDINALS).astype(np.float64)
+    # dist[b, o]: probability that a hand from bucket b has ordinal o
+    dist = np.zeros((num_buckets, NUM_ORDINALS))
+    dist[buckets, np.arange(NUM_ORDINALS)] = counts
+    prior = dist.sum(axis=1) / counts.sum()
+    dist /= dist.sum(axis=1, keepdims=True)
+    below = np.cumsum(dist, axis=1) - dist  # P(ordinal < o)
+    win = dist @ below.T
+    loss = dist @ (1 - below - dist).T
+    return prior, win, loss
+
+
+def legal_mask(coins: int, to_call: int) -> np.ndarray:
+    """Legal actions for a seat holding `coins` that must put in at least `to_call`"""
+    min_bet = max(to_call, 1)
+    mask = np.zeros(NUM_ACTIONS, dtype=bool)
+    mask[FOLD] = True
+    mask[BET1] = coins >= min_bet
+    mask[BET2] = coins >= max(2, min_bet)
+    return mask
+
+
+def regret_matching(regrets: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Current strategy from positive regrets; uniform over legal actions when none are positive"""
+    positive = np.where(mask, np.maximum(regrets, 0), 0)
+    total = positive.sum(axis=-1, keepdims=True)
+    uniform = np.broadcast_to(mask / mask.sum(), positive.shape)
+    return np.where(total > 0, positive / np.where(total > 0, total, 1), uniform)
+
+
+def showdown_payoffs(win: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    """
+    payoff[opening bet, response, i, j]: the first actor's expected coins when it
+    holds bucket i, the responder holds bucket j and both bet. Each seat risks
+    what it put in, so a call or raise to b2 wins b2 and loses the opening bet.
+    Fold responses are 0: the opener just takes its own bet back.
+    """
+    num_buckets = win.shape[0]
+    payoff = np.zeros((3, NUM_ACTIONS, num_buckets, num_buckets))
+    for opening in (1, 2):
+        for response in (BET1, BET2):
+            amount = max(response, opening)  # Action id doubles as the bet size
+            payoff[opening, response] = amount * win - opening * loss
+    return payoff
+
+
+def solve_stacks(first_coins: int, second_coins: int, prior: np.ndarray, win: np.ndarray, loss: np.ndarray,
+                 iterations: int) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Solve one stack combination. Returns the first actor's average strategy
+    [bucket, action], the responder's [opening bet, bucket, action] and the
+    exploitability in coins per round.
+    """
+    num_buckets = prior.size
+    payoff = showdown_payoffs(win, loss)
+    first_mask = legal_mask(first_coins, 0)
+    second_masks = np.stack([legal_mask(second_coins, opening) for opening in range(3)])
+
+    first_regrets = np.zeros((num_buckets, NUM_ACTIONS))
+    second_regrets = np.zeros((3, num_buckets, NUM_ACTIONS))
+    first_average = np.zeros_like(first_regrets)
+    second_average = np.zeros_like(second_regrets)
+
+    for t in range(1, iterations + 1):
+        # First actor: value of each opening against the responder's current strategy
+        second = regret_matching(second_regrets, second_masks[:, None, :])
+        first = regret_matching(first_regrets, first_mask)
+        first_values = opening_values(second, payoff, prior)
+        node = (first * first_values).sum(axis=1, keepdims=True)
+        first_regrets = np.where(first_mask, np.maximum(first_regrets + first_values - node, 0), 0)
+        first = regret_matching(first_regrets, first_mask)
+        first_average += t * first
+
+        # Responder, against the updated opener; values are weighted by the opener's reach
+        second_values = response_values(first, payoff, prior)
+        node = (second * second_values).sum(axis=2, keepdims=True)
+        second_regrets = np.where(second_masks[:, None, :],
+                                  np.maximum(second_regrets + second_values - node, 0), 0)
+        second_average += t * regret_matching(second_regrets, second_masks[:, None, :])
+
+    first_average = normalise(first_average, first_mask)
+    second_average = normalise(second_average, second_masks[:, None, :])
+    exploitability = (opening_values(second_average, payoff, prior).max(axis=1,
+                      where=first_mask, initial=-np.inf) @ prior
+                      + (response_values(first_average, payoff, prior).max(axis=2,
+                         where=second_masks[:, None, :], initial=-np.inf)[1:].sum(axis=0) @ prior)) / 2
+    return first_average, second_average, float(exploitability)
+
+
+def opening_values(second: np.ndarray, payoff: np.ndarray, prior: np.ndarray) -> np.ndarray:
+    """First actor's expected coins for each (bucket, opening action)"""
+    values = np.zeros((prior.size, NUM_ACTIONS))
+    for opening in (BET1, BET2):
+        # sum over responder bucket j and response r of P(j) * P(r | j) * payoff
+        values[:, opening] = np.einsum('j,jr,rij->i', prior, second[opening], payoff[opening])
+    return values
+
+
+def response_values(first: np.ndarray, payoff: np.ndarray, prior: np.ndarray) -> np.ndarray:
+    """
+    Responder's counterfactual value of each (opening bet, bucket, response):
+    its coins, weighted by the chance the opener holds each bucket and opens that way
+    """
+    values = np.zeros((3, prior.size, NUM_ACTIONS))
+    for opening in (BET1, BET2):
+        values[opening] = -np.einsum('i,i,rij->jr', prior, first[:, opening], payoff[opening])
+    return values
+
+
+def normalise(totals: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Strategy from accumulated weights, uniform over legal actions where nothing accumulated"""
+    totals = np.where(mask, totals, 0)
+    sums = totals.sum(axis=-1, keepdims=True)
+    uniform = np.broadcast_to(mask / np.maximum(mask.sum(axis=-1, keepdims=True), 1), totals.shape)
+    return np.where(sums > 0, totals / np.where(sums > 0, sums, 1), uniform)
+
+
+class CFRPolicy:
+    """
+    Equilibrium policy table from solve_cfr.
+    first[first coins, second coins, bucket, action] is the dealer's opening strategy and
+    second[first coins, second coins, opening bet, bucket, action] the response to it,
+    with coins capped at MAX_COINS.
+    """
+    def __init__(self, buckets: np.ndarray, first: np.ndarray, second: np.ndarray,
+                 exploitability: Optional[Dict[Tuple[int, int], float]] = None):
+        self.buckets = buckets
+        self.first = first
+        self.second = second
+        self.exploitability = exploitability or {}
+
+    @property
+    def num_buckets(self) -> int:
+        return self.first.shape[2]
+
+    def action_probabilities(self, state) -> Optional[np.ndarray]:
+        """
+        Probabilities over ACTIONS for the seat to act in `state`, or None when
+        the state is outside the solved tree: terminal, already holding a bet, or
+        not the dealer's opening or the other seat's response to it.
+        """
+        if state.is_terminal() or state.player_bet > 0:
+            return None
+        if state.is_dealer != (state.opponent_bet == 0):
+            # E.g. the non-dealer asked before the dealer has opened
+            return None
+        bucket = self.buckets[hand_ordinal(state.player_hand)]
+        mine = min(state.player_coins, MAX_COINS)
+        theirs = min(state.opponent_coins + state.opponent_bet, MAX_COINS)
+        if state.opponent_bet == 0:
+            return self.first[mine, theirs, bucket]
+        if state.opponent_bet > MAX_COINS:
+            return None
+        return self.second[theirs, mine, state.opponent_bet, bucket]
+
+    def get_action(self, state, rng=random) -> Optional[str]:
+        """Sample an action from the equilibrium mix, or None outside the solved tree"""
+        probabilities = self.action_probabilities(state)
+        if probabilities is None:
+            return None
+        return ACTIONS[int(np.searchsorted(np.cumsum(probabilities), rng.random() * probabilities.sum(),
+                                           side='right').clip(max=NUM_ACTIONS - 1))]
+
+    def save(self, path: str) -> None:
+        stacks = sorted(self.exploitability)
+        np.savez_compressed(path, buckets=self.buckets, first=self.first, second=self.second,
+                            stacks=np.array(stacks, dtype=np.int64).reshape(-1, 2),
+                            exploitability=np.array([self.exploitability[s] for s in stacks]))
+
+    @classmethod
+    def load(cls, path: str) -> 'CFRPolicy':
+        with np.load(path) as data:
+            exploitability = {tuple(int(c) for c in stacks): float(value)
+                              for stacks, value in zip(data['stacks'], data['exploitability'])}
+            return cls(data['buckets'], data['first'], data['second'], exploitability)
+
+
+def solve_cfr(num_buckets: int = DEFAULT_BUCKETS, iterations: int = 1000) -> CFRPolicy:
+    """Solve every stack combination and collect the average strategies into a CFRPolicy"""
+    buckets = ordinal_buckets(num_buckets)
+    prior, win, loss = bucket_showdowns(buckets, num_buckets)
+    size = MAX_COINS + 1
+    first = np.zeros((size, size, num_buckets, NUM_ACTIONS))
+    second = np.zeros((size, size, 3, num_buckets, NUM_ACTIONS))
+    exploitability = {}
+    for first_coins in range(1, size):
+        for second_coins in range(1, size):
+            opening, response, gap = solve_stacks(first_coins, second_coins, prior, win, loss, iterations)
+            first[first_coins, second_coins] = opening
+            second[first_coins, second_coins] = response
+            exploitability[(first_coins, second_coins)] = gap
+    return CFRPolicy(buckets, first, second, exploitability)
+
+
+if __name__ == "__main__":
+    policy = solve_cfr()
+    for stacks, gap in sorted(policy.exploitability.items()):
+        print(f"Stacks {stacks}: exploitability {gap:.5f} coins/round")
+    policy.save('cfr_policy.npz')
+    print("Policy saved to 'cfr_policy.npz'")
@@ -0,0 +1,136 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from cards import HANDS, HAND_ORDINALS, NUM_ORDINALS, Card, lookup_index
+
+# Every 3-card hand as card ids, a 52-bit card mask and a strength ordinal,
+# all aligned with the cards.hand_index ordering
+HAND_CARDS = np.array(HANDS, dtype=np.int8)
+HAND_MASKS = np.bitwise_or.reduce(np.left_shift(np.uint64(1), HAND_CARDS.astype(np.uint64)), axis=1)
+HAND_STRENGTHS = np.array(HAND_ORDINALS, dtype=np.int16)
+
+
+def blocked_hands(index: int) -> np.ndarray:
+    """Boolean mask of hands sharing at least one card with hand `index`"""
+    return (HAND_MASKS & HAND_MASKS[index]) != 0
+
+
+@lru_cache(maxsize=None)
+def equity_by_index(index: int) -> Tuple[float, float, float]:
+    """
+    Exact (win, tie, loss) probabilities of hand `index` at showdown against
+    every opponent holding that does not share a card with it: C(49, 3) = 18,424 hands.
+    """
+    live = ~blocked_hands(index)
+    opponents = HAND_STRENGTHS[live]
+    ours = HAND_STRENGTHS[index]
+    total = opponents.size
+    wins = int(np.count_nonzero(opponents < ours))
+    ties = int(np.count_nonzero(opponents == ours))
+    return wins / total, ties / total, (total - wins - ties) / total
+
+
+def showdown_equity(hand: Iterable[Card]) -> Tuple[float, float, float]:
+    """(win, tie, loss) probabilities for a 3-card hand against a uniformly random opponent"""
+    index = lookup_index(hand)
+    if index is None:
+        raise ValueError(f"Not a three-card hand of distinct known cards: {hand!r}")
+    return equity_by_index(index)
+
+
+@lru_cache(maxsize=None)
+def action_likelihoods(informativeness: float = 0.5) -> np.ndarray:
+    """
+    P(fold, bet1, bet2 | hand) for every hand, shape (3, NUM_HANDS), rows in
+    cards.ACTIONS order. A hand at strength percentile q folds with (1 - q)^2,
+    bets 1 with 2q(1 - q) and bets 2 with q^2; that is mixed with uniformly random
+    play in proportion 1 - informativeness, so 0 is the MCTS rollout opponent.
+    """
+    counts = np.bincount(HAND_STRENGTHS, minlength=NUM_ORDINALS)
+    percentile = ((np.cumsum(counts) - counts / 2) / counts.sum())[HAND_STRENGTHS]
+    informed = np.stack([(1 - percentile) ** 2, 2 * percentile * (1 - percentile), percentile ** 2])
+    likelihoods = (1 - informativeness) / 3 + informativeness * informed
+    likelihoods.setflags(write=False)
+    return likelihoods
+
+
+class OpponentRange:
+    """
+    Weights over every opponent hand that does not share a card with ours,
+    narrowed by Bayes' rule as the opponent's actions are observed. The weights
+    are updated in place and kept normalised; equity, action probabilities and
+    conditional values are recomputed once per observation, so reading them is free.
+    """
+    def __init__(self, hand: Iterable[Card], likelihoods: Optional[np.ndarray] = None):
+        self.likelihoods = action_likelihoods() if likelihoods is None else likelihoods
+        self.reset(hand)
+
+    def reset(self, hand: Iterable[Card]) -> None:
+        """Uniform range for a new round in which we hold `hand`"""
+        index = lookup_index(hand)
+        if index is None:
+            raise ValueError(f"Not a three-card hand of distinct known cards: {hand!r}")
+        self.hand = index
+        ours = HAND_STRENGTHS[index]
+        # outcomes[k, h]: 1 if we win (k=0), tie (k=1) or lose (k=2) against hand h
+        self.outcomes = np.stack([HAND_STRENGTHS < ours, HAND_STRENGTHS == ours,
+                                  HAND_STRENGTHS > ours]).astype(np.float64)
+        self.weights = (~blocked_hands(index)).astype(np.float64)
+        self.weights /= self.weights.sum()
+        self.observed_bet = 0  # Coins the observed actions put in this round
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self._equity = self.outcomes @ self.weights
+        self._value = float(self._equity[0] - self._equity[2])
+        self._actions = self.likelihoods @ self.weights
+        # Plain floats, for sampling responses in the MCTS rollout loop
+        self._thresholds = (float(self._actions[0]), float(self._actions[0] + self._actions[1]))
+        self._after: Dict[Tuple[int, int], float] = {}
+
+    def likelihood(self, amount: int, min_bet: int = 1) -> np.ndarray:
+        """
+        P(observing a bet of `amount` coins | hand); amount 0 is a fold. When the
+        call forces min_bet = 2, asking for bet1 or bet2 both put in 2.
+        """
+        if amount == 0:
+            return self.likelihoods[0]
+        if min_bet >= 2:
+            return self.likelihoods[1] + self.likelihoods[2]
+        return self.likelihoods[amount]
+
+    def observe(self, amount: int, min_bet: int = 1) -> None:
+        """Condition the range on the opponent putting in `amount` coins (0 for a fold)"""
+        self.weights *= self.likelihood(amount, min_bet)
+        self.weights /= self.weights.sum()
+        self.observed_bet += amount
+        self._refresh()
+
+    def equity(self) -> Tuple[float, float, float]:
+        """(win, tie, loss) probabilities at showdown against the range"""
+        win, tie, loss = self._equity
+        return float(win), float(tie), float(loss)
+
+    def value(self) -> float:
+        """Win - loss showdown equity against the range"""
+        return self._value
+
+    def action_probabilities(self) -> np.ndarray:
+        """Probabilities of the opponent's next fold / bet1 / bet2 under the range"""
+        return self._actions
+
+    def response_thresholds(self) -> Tuple[float, float]:
+        """Cumulative P(fold) and P(fold or bet1): a uniform draw below them picks that action"""
+        return self._thresholds
+
+    def value_after(self, amount: int, min_bet: int = 1) -> float:
+        """Win - loss equity if the opponent next put in `amount` coins, without changing the range"""
+        key = (amount, min_bet)
+        value = self._after.get(key)
+        if value is None:
+            weights = self.weights * self.likelihood(amount, min_bet)
+            win, _, loss = self.outcomes @ weights / weights.sum()
+            value = self._after[key] = float(win - loss)
+        return value
@@ -0,0 +1,66 @@
+"""
+Append-only hand-history file.
+
+Every finished round is one compact JSON line: the round number, dealer,
+stacks before the deal, both hands as card ids, the actions in order and the
+result. Records are buffered and written in batches, so a long bot-vs-bot
+session pays for a write only every few dozen hands. A crash can lose the
+unflushed batch and leave a torn last line; read_history skips such a line
+and the next write starts a fresh one.
+"""
+import json
+import os
+from typing import Dict, Iterator, List
+
+DEFAULT_PATH = 'hand_history.jsonl'
+DEFAULT_BATCH_SIZE = 64
+
+
+class HandHistory:
+    """Buffered JSON Lines writer of round records"""
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending: List[str] = []
+        self.written = 0  # Records written to disk by this writer
+        # Last line has no newline (a crash mid-write), so the next batch must start a new one
+        self._torn = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                self._torn = f.read(1) != b'\n'
+
+    def write(self, record: Dict) -> None:
+        """Queue one round record; the batch is written once batch_size records are waiting"""
+        self.pending.append(json.dumps(record, separators=(',', ':')))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued record to disk"""
+        if not self.pending:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(('\n' if self._torn else '') + '\n'.join(self.pending) + '\n')
+        self._torn = False
+        self.written += len(self.pending)
+        self.pending = []
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'HandHistory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_history(path: str = DEFAULT_PATH) -> Iterator[Dict]:
+    """Round records from a history file, one at a time, skipping lines cut short by a crash"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
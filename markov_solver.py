@@ -0,0 +1,151 @@
+"""
+Exact win rates for the abstract strategy-vs-strategy game.
+
+Hand strengths are uniform on 0..10 and strategies depend only on
+(coins, hand_strength), so a game is a finite Markov chain over the live
+(player_coins, opponent_coins) states. One round is a transition matrix Q
+between live states plus a matrix R into the absorbing outcomes
+(player win, opponent win, draw). The round rules are the ones in
+batch_simulator, so both engines agree on every Rules variant.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from batch_simulator import FOLD, MATRIX_RULES, NUM_HAND_STRENGTHS, Rules
+from cards import NUM_ACTIONS
+
+State = Tuple[int, int]
+PLAYER_WIN, OPPONENT_WIN, DRAW = 0, 1, 2
+
+# Ordering of the two hands: player ahead, tied, behind
+_HANDS = np.arange(NUM_HAND_STRENGTHS)
+_COMPARISONS = np.stack([_HANDS[:, None] > _HANDS[None, :],
+                         _HANDS[:, None] == _HANDS[None, :],
+                         _HANDS[:, None] < _HANDS[None, :]]).astype(np.float64)
+
+
+def live_states(starting_coins: int) -> List[State]:
+    """Every reachable non-terminal state; coins are never created, only lost or moved"""
+    total = 2 * starting_coins
+    return [(p, o) for p in range(1, total) for o in range(1, total - p + 1)]
+
+
+def settle_round(player_coins: int, opponent_coins: int, player_action: int, opponent_action: int,
+                 comparison: int, rules: Rules) -> State:
+    """Coins after one round; comparison is 0 if the player's hand is higher, 1 for a tie, 2 if lower"""
+    player_bet = min(player_action, player_coins)
+    opponent_bet = min(opponent_action, opponent_coins) if rules.cap_opponent_bet else opponent_action
+    player_coins -= player_bet
+    opponent_coins -= opponent_bet
+    pot = player_bet + opponent_bet
+
+    if player_action == FOLD or opponent_action == FOLD:
+        if rules.fold_pays_pot:
+            if player_action == FOLD:
+                opponent_coins += pot
+            else:
+                player_coins += pot
+    elif comparison == 0:
+        player_coins += pot
+    elif comparison == 2:
+        opponent_coins += pot
+    else:
+        player_coins += player_bet
+        opponent_coins += opponent_bet
+    return player_coins, opponent_coins
+
+
+def score_outcome(player_coins: int, opponent_coins: int, rules: Rules) -> int:
+    """Outcome of a finished game, scored like batch_simulator.tally_outcomes"""
+    if rules.outcome == 'bust':
+        if player_coins > 0 and opponent_coins == 0:
+            return PLAYER_WIN
+        if opponent_coins > 0 and player_coins == 0:
+            return OPPONENT_WIN
+        return DRAW
+    if player_coins > opponent_coins:
+        return PLAYER_WIN
+    if opponent_coins > player_coins:
+        return OPPONENT_WIN
+    return DRAW
+
+
+def transition_matrices(player_table: np.ndarray, opponent_table: np.ndarray, rules: Rules = MATRIX_RULES,
+                        starting_coins: int = 5) -> Tuple[List[State], np.ndarray, np.ndarray]:
+    """
+    One-round transition matrices of a matchup: the live states, Q (live -> live)
+    and R (live -> player win / opponent win / draw).
+    """
+    states = live_states(starting_coins)
+    position: Dict[State, int] = {state: i for i, state in enumerate(states)}
+    q = np.zeros((len(states), len(states)))
+    r = np.zeros((len(states), 3))
+
+    for i, (player_coins, opponent_coins) in enumerate(states):
+        player_probs = player_table[min(player_coins, player_table.shape[0] - 1)]
+        opponent_probs = opponent_table[min(opponent_coins, opponent_table.shape[0] - 1)]
+        # weights[c, a, b]: P(hand comparison c, player action a, opponent action b)
+        weights = np.einsum('cxy,xa,yb->cab', _COMPARISONS, player_probs, opponent_probs) / NUM_HAND_STRENGTHS ** 2
+        for comparison in range(3):
+            for player_action in range(NUM_ACTIONS):
+                for opponent_action in range(NUM_ACTIONS):
+                    weight = weights[comparison, player_action, opponent_action]
+                    if weight == 0:
+                        continue
+                    after = settle_round(player_coins, opponent_coins, player_action, opponent_action,
+                                         comparison, rules)
+                    if after[0] <= 0 or after[1] <= 0:
+                        r[i, score_outcome(*after, rules)] += weight
+                    else:
+                        q[i, position[after]] += weight
+    return states, q, r
+
+
+def solve_matchup(player_table: np.ndarray, opponent_table: np.ndarray, rules: Rules = MATRIX_RULES,
+                  starting_coins: int = 5, max_rounds: Optional[int] = 1000) -> Tuple[float, float, float]:
+    """
+    Exact (player win, opponent win, draw) probabilities of a game.
+    Games still running after max_rounds are scored on their stacks like the
+    simulators do; max_rounds=None gives the limit of an unbounded game, where
+    games that can never finish count as draws.
+    """
+    states, q, r = transition_matrices(player_table, opponent_table, rules, starting_coins)
+    start = states.index((starting_coins, starting_coins))
+
+    if max_rounds is None:
+        return _absorb(q, r, start)
+
+    distribution = np.zeros(len(states))
+    distribution[start] = 1.0
+    outcomes = np.zeros(3)
+    for _ in range(max_rounds):
+        outcomes += distribution @ r
+        distribution = distribution @ q
+        if not distribution.any():
+            break
+    # Games cut off by the round cap
+    for i, (player_coins, opponent_coins) in enumerate(states):
+        outcomes[score_outcome(player_coins, opponent_coins, rules)] += distribution[i]
+    return float(outcomes[0]), float(outcomes[1]), float(outcomes[2])
+
+
+def _absorb(q: np.ndarray, r: np.ndarray, start: int) -> Tuple[float, float, float]:
+    """Absorption probabilities of the unbounded chain, solving (I - Q) B = R"""
+    # States that can still reach an absorbing outcome; the rest loop forever (draws)
+    can_finish = r.sum(axis=1) > 0
+    while True:
+        grown = can_finish | ((q[:, can_finish] > 0).any(axis=1))
+        if (grown == can_finish).all():
+            break
+        can_finish = grown
+    if not can_finish[start]:
+        return 0.0, 0.0, 1.0
+
+    stuck = q[can_finish][:, ~can_finish].sum(axis=1)
+    transient = q[np.ix_(can_finish, can_finish)]
+    absorbing = r[can_finish].copy()
+    absorbing[:, DRAW] += stuck
+    solved = np.linalg.solve(np.eye(transient.shape[0]) - transient, absorbing)
+    row = int(np.count_nonzero(can_finish[:start]))
+    return float(solved[row, 0]), float(solved[row, 1]), float(solved[row, 2])
@@ -0,0 +1,117 @@
+"""
+Process-pool runner for strategy matchups.
+
+Each (player strategy, opponent strategy) pair is split into fixed-size chunks
+of games. Every chunk draws from its own SeedSequence derived from the master
+seed, the two strategy names and the chunk number, so the tallies are
+bit-identical for a fixed master seed whatever the worker count, and adding a
+strategy does not change the results of existing pairs.
+With a target_width, each pair is instead one adaptive task that plays chunks
+until its win-rate interval is narrow enough (see simulate_games_adaptive).
+"""
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_simulator import MATRIX_RULES, Rules, simulate_games_adaptive, simulate_games_batch
+
+Pair = Tuple[str, str]
+Counts = Tuple[int, int, int]
+
+
+def shard_seed(master_seed: int, pair: Pair, chunk: int) -> np.random.SeedSequence:
+    """Reproducible seed for one chunk of one strategy pair"""
+    player_strategy, opponent_strategy = pair
+    return np.random.SeedSequence([master_seed, zlib.crc32(player_strategy.encode()),
+                                   zlib.crc32(opponent_strategy.encode()), chunk])
+
+
+def run_shard(player_table: np.ndarray, opponent_table: np.ndarray, num_games: int, rules: Rules,
+              seed: np.random.SeedSequence, starting_coins: int = 5, max_rounds: int = 1000) -> Counts:
+    """Worker entry point: simulate one chunk of games"""
+    return simulate_games_batch(player_table, opponent_table, num_games, rules,
+                                starting_coins, max_rounds, np.random.default_rng(seed))
+
+
+def run_adaptive_shard(player_table: np.ndarray, opponent_table: np.ndarray, max_games: int, rules: Rules,
+                       seed: np.random.SeedSequence, starting_coins: int = 5, max_rounds: int = 1000,
+                       target_width: float = 0.02, chunk_size: int = 500) -> Counts:
+    """Worker entry point: play one pair adaptively; the counts sum to the games played"""
+    counts, _ = simulate_games_adaptive(player_table, opponent_table, rules, target_width, chunk_size, max_games,
+                                        starting_coins, max_rounds, rng=np.random.default_rng(seed))
+    return counts
+
+
+def plan_chunks(num_games: int, chunk_size: int) -> List[int]:
+    """Sizes of the chunks a pair's games are split into"""
+    sizes = [chunk_size] * (num_games // chunk_size)
+    if num_games % chunk_size:
+        sizes.append(num_games % chunk_size)
+    return sizes
+
+
+def iter_matchups(pairs: Sequence[Pair], tables: Dict[str, np.ndarray], num_games: int,
+                  rules: Rules = MATRIX_RULES, master_seed: int = 0, chunk_size: int = 2500,
+                  workers: Optional[int] = None, starting_coins: int = 5, max_rounds: int = 1000,
+                  progress: bool = True, target_width: Optional[float] = None) -> Iterator[Tuple[int, Pair, Counts]]:
+    """
+    Simulate `num_games` games for every pair and yield (pair index, pair, counts)
+    as soon as all chunks of a pair are done. Counts are (player wins, opponent wins, draws).
+    With target_width, num_games caps each pair's games and a pair stops once the 95%
+    Wilson interval of its win rate is that narrow; the counts then sum to the games played.
+    """
+    from tqdm import tqdm
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    # An adaptive pair is a single task; its games are chunked inside the worker
+    chunks = [num_games] if target_width is not None else plan_chunks(num_games, chunk_size)
+    totals = [np.zeros(3, dtype=np.int64) for _ in pairs]
+    remaining = [len(chunks)] * len(pairs)
+    bar = tqdm(total=len(pairs) * len(chunks), desc="Strategy chunks", disable=not progress)
+
+    def finish(index: int, counts: Counts):
+        totals[index] += counts
+        remaining[index] -= 1
+        bar.update(1)
+        if remaining[index] == 0:
+            return index, pairs[index], tuple(int(n) for n in totals[index])
+        return None
+
+    def tasks():
+        for index, pair in enumerate(pairs):
+            for chunk, size in enumerate(chunks):
+                args = (tables[pair[0]], tables[pair[1]], size, rules,
+                        shard_seed(master_seed, pair, chunk), starting_coins, max_rounds)
+                if target_width is not None:
+                    yield index, run_adaptive_shard, args + (target_width, chunk_size)
+                else:
+                    yield index, run_shard, args
+
+    try:
+        if workers <= 1:
+            for index, function, args in tasks():
+                done = finish(index, function(*args))
+                if done is not None:
+                    yield done
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(function, *args): index for index, function, args in tasks()}
+            for future in as_completed(futures):
+                done = finish(futures[future], future.result())
+                if done is not None:
+                    yield done
+    finally:
+        bar.close()
+
+
+def run_matchups(pairs: Sequence[Pair], tables: Dict[str, np.ndarray], num_games: int,
+                 **kwargs) -> List[Counts]:
+    """Counts for every pair, in the order of `pairs`; see iter_matchups for the options"""
+    results: List[Optional[Counts]] = [None] * len(pairs)
+    for index, _, counts in iter_matchups(pairs, tables, num_games, **kwargs):
+        results[index] = counts
+    return results
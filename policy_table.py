@@ -0,0 +1,153 @@
+"""
+Offline policy table for ZhaJinHuaAI.
+
+The MCTS agent's model of a decision depends only on the hand's showdown
+equity and the coin/bet state: our bets, a uniformly random opponent response,
+a +-1 reward when someone folds and win - loss equity at showdown. That model
+is small enough to solve exactly. build_table runs a full expectimax over every
+(hand ordinal, player coins, opponent coins, player bet, opponent bet, dealer)
+state, which is the value MCTS converges to with unlimited iterations, and
+writes the best action and its value to a structured .npy file.
+PolicyTable memory-maps that file, so loading is instant and each lookup is
+one array read.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+from cards import ACTIONS, ACTION_IDS, NUM_ORDINALS, hand_ordinal
+from equity import HAND_STRENGTHS, equity_by_index
+
+MAX_COINS = 10  # Both stacks together hold 2 * starting_coins
+MAX_BET = 2     # A seat to act has put in at most one bet of 1 or 2
+ENTRY = np.dtype([('action', 'i1'), ('value', 'f4')])
+NO_ACTION = -1  # Terminal or unreachable states
+DEFAULT_PATH = 'policy_table.npy'
+
+
+def ordinal_equities() -> np.ndarray:
+    """Mean win - loss showdown equity of the hands at each strength ordinal, card removal included"""
+    totals = np.zeros(NUM_ORDINALS)
+    for index, ordinal in enumerate(HAND_STRENGTHS):
+        win, _, loss = equity_by_index(index)
+        totals[ordinal] += win - loss
+    return totals / np.bincount(HAND_STRENGTHS, minlength=NUM_ORDINALS)
+
+
+def is_terminal(player_coins: int, opponent_coins: int, player_bet: int, opponent_bet: int) -> bool:
+    """ZhaJinHuaState.is_terminal for a state that is not game_over"""
+    return player_coins <= 0 or opponent_coins <= 0 or (player_bet > 0 and opponent_bet > 0)
+
+
+class Expectimax:
+    """
+    Exact values of MCTS.simulate_action's model, vectorised over hand ordinals.
+    Every value is an array with one entry per ordinal.
+    """
+    def __init__(self, equities: np.ndarray):
+        self.equities = equities
+        self.decide = lru_cache(maxsize=None)(self._decide)
+
+    @staticmethod
+    def fold_reward(player_coins: int, opponent_coins: int) -> float:
+        """MCTS.calculate_reward for a game_over state"""
+        return 1.0 if player_coins > opponent_coins else -1.0
+
+    def evaluate(self, player_coins: int, opponent_coins: int, player_bet: int, opponent_bet: int,
+                 is_dealer: bool) -> np.ndarray:
+        """Value of a state that is not game_over: showdown equity if terminal, else our best action"""
+        if is_terminal(player_coins, opponent_coins, player_bet, opponent_bet):
+            return self.equities
+        return self.decide(player_coins, opponent_coins, player_bet, opponent_bet, is_dealer)[0]
+
+    def _decide(self, player_coins: int, opponent_coins: int, player_bet: int, opponent_bet: int,
+                is_dealer: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """(best value, best action id) per ordinal for a non-terminal state"""
+        pot = player_bet + opponent_bet
+        if is_dealer:
+            fold = self.fold_reward(player_coins, opponent_coins + pot)
+        else:
+            fold = self.fold_reward(player_coins + pot, opponent_coins)
+        q = np.full((len(ACTIONS), NUM_ORDINALS), -np.inf)
+        q[ACTION_IDS['fold']] = fold
+
+        min_bet = max(opponent_bet - player_bet, 1)
+        for action in ('bet1', 'bet2'):
+            amount = max(int(action[3]), min_bet)
+            if player_coins < amount:
+                continue
+            q[ACTION_IDS[action]] = self.after_bet(player_coins - amount, opponent_coins,
+                                                   player_bet + amount, opponent_bet, is_dealer)
+        best = np.argmax(q, axis=0)
+        return q[best, np.arange(NUM_ORDINALS)], best.astype(np.int8)
+
+    def after_bet(self, player_coins: int, opponent_coins: int, player_bet: int, opponent_bet: int,
+                  is_dealer: bool) -> np.ndarray:
+        """Value after our bet, averaging MCTS.simulate_opponent_action's uniform response"""
+        if is_terminal(player_coins, opponent_coins, player_bet, opponent_bet):
+            return self.equities
+        # Opponent folds: we take the pot
+        total = np.full(NUM_ORDINALS, self.fold_reward(player_coins + player_bet + opponent_bet, opponent_coins))
+        min_bet = max(player_bet - opponent_bet, 1)
+        for bet in (1, 2):
+            amount = max(bet, min_bet)
+            if opponent_coins >= amount:
+                total = total + self.evaluate(player_coins, opponent_coins - amount,
+                                              player_bet, opponent_bet + amount, is_dealer)
+            else:
+                # The opponent can't cover it and the state is unchanged; we act again
+                total = total + self.evaluate(player_coins, opponent_coins, player_bet, opponent_bet, is_dealer)
+        return total / 3
+
+
+def build_table(path: str = DEFAULT_PATH, equities: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Solve every state and write the table, shape
+    (ordinal, player coins, opponent coins, player bet, opponent bet, is_dealer).
+    """
+    solver = Expectimax(ordinal_equities() if equities is None else equities)
+    coins, bets = MAX_COINS + 1, MAX_BET + 1
+    table = np.zeros((NUM_ORDINALS, coins, coins, bets, bets, 2), dtype=ENTRY)
+    table['action'] = NO_ACTION
+    for player_coins in range(coins):
+        for opponent_coins in range(coins):
+            for player_bet in range(bets):
+                for opponent_bet in range(bets):
+                    if is_terminal(player_coins, opponent_coins, player_bet, opponent_bet):
+                        continue
+                    for is_dealer in (False, True):
+                        values, actions = solver.decide(player_coins, opponent_coins, player_bet,
+                                                        opponent_bet, is_dealer)
+                        cell = table[:, player_coins, opponent_coins, player_bet, opponent_bet, int(is_dealer)]
+                        cell['action'] = actions
+                        cell['value'] = values
+    np.save(path, table)
+    return table
+
+
+class PolicyTable:
+    """Memory-mapped table from build_table; pages are read from disk only when looked up"""
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.table = np.load(path, mmap_mode='r')
+
+    def lookup(self, state) -> Optional[Tuple[str, float]]:
+        """(best action, value) for `state`, or None if it is outside the table"""
+        if state.game_over or not (0 <= state.player_coins <= MAX_COINS and 0 <= state.opponent_coins <= MAX_COINS
+                                   and 0 <= state.player_bet <= MAX_BET and 0 <= state.opponent_bet <= MAX_BET):
+            return None
+        entry = self.table[hand_ordinal(state.player_hand), state.player_coins, state.opponent_coins,
+                           state.player_bet, state.opponent_bet, int(state.is_dealer)]
+        if entry['action'] == NO_ACTION:
+            return None
+        return ACTIONS[entry['action']], float(entry['value'])
+
+    def get_action(self, state) -> Optional[str]:
+        found = self.lookup(state)
+        return None if found is None else found[0]
+
+
+if __name__ == "__main__":
+    table = build_table()
+    print(f"Wrote {DEFAULT_PATH}: {table.size} states, {table.nbytes / 1e6:.1f} MB")
@@ -0,0 +1,182 @@
+"""
+Replay recorded hands through ZhaJinHuaAI.
+
+Streams a hand-history file (see hand_history) one record at a time, rebuilds
+the ZhaJinHuaState every recorded decision was made from, and re-evaluates
+those states with the current agent in fixed-size batches. Each batch runs
+with its own seed derived from the master seed and the batch number, so the
+comparisons are identical for any worker count. Comparisons are written to a
+JSON Lines file as each batch finishes; nothing holds the whole history in memory.
+
+    python replay.py hand_history.jsonl --output replay.jsonl --iterations 500 --workers 4
+"""
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from MCTS_agent import ZhaJinHuaAI, ZhaJinHuaScoreCalculator, ZhaJinHuaState
+from hand_history import read_history
+
+DEFAULT_BATCH_SIZE = 256
+
+
+class Decision(NamedTuple):
+    """One recorded decision: the acting seat's view and the action it asked for"""
+    hand: int      # Position of the record in the history file
+    round: int
+    seat: int
+    state: ZhaJinHuaState
+    action: str
+
+
+def iter_decisions(records: Iterable[Dict]) -> Iterator[Decision]:
+    """Replay each record's actions from its starting stacks, yielding the state before every action"""
+    for hand, record in enumerate(records):
+        coins = list(record['coins'])
+        bets = [0, 0]
+        for seat, action, amount in record['actions']:
+            other = 1 - seat
+            state = ZhaJinHuaState(record['hands'][seat], coins[seat], coins[other],
+                                   bets[seat], bets[other], record['dealer'] == seat)
+            yield Decision(hand, record['round'], seat, state, action)
+            coins[seat] -= amount
+            bets[seat] += amount
+
+
+def effective_bet(state: ZhaJinHuaState, action: str) -> int:
+    """Coins `action` puts in under the engine's rules; 0 for a fold or a bet the seat can't cover"""
+    if action == 'fold':
+        return 0
+    amount = max(int(action[3:]), state.opponent_bet - state.player_bet, 1)
+    return amount if amount <= state.player_coins else 0
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Consecutive lists of up to `size` items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def batch_seed(master_seed: int, batch: int) -> int:
+    return int(np.random.SeedSequence([master_seed, batch]).generate_state(1)[0])
+
+
+def evaluate_batch(states: List[ZhaJinHuaState], seed: int,
+                   ai_options: Dict) -> List[Tuple[str, str, int, Dict[str, float]]]:
+    """Worker entry point: (action, source, iterations, root values) of a fresh agent for each state"""
+    ai = ZhaJinHuaAI(ZhaJinHuaScoreCalculator(), seed=seed, **ai_options)
+    results = []
+    for state in states:
+        action, stats = ai.get_best_action(state, return_stats=True)
+        results.append((action, stats.source, ai.last_iterations, stats.root_values))
+    ai.close()
+    return results
+
+
+def compare(decision: Decision, result: Tuple[str, str, int, Dict[str, float]]) -> Dict:
+    """Comparison record of one decision; EVs are the search's mean rewards, None when not searched"""
+    action, source, iterations, values = result
+    state = decision.state
+    return {
+        'hand': decision.hand,
+        'round': decision.round,
+        'seat': decision.seat,
+        'state': [state.player_coins, state.opponent_coins, state.player_bet, state.opponent_bet,
+                  state.is_dealer],
+        'recorded': decision.action,
+        'ai': action,
+        'agree': effective_bet(state, decision.action) == effective_bet(state, action),
+        'ev_recorded': values.get(decision.action),
+        'ev_ai': values.get(action),
+        'source': source,
+        'iterations': iterations,
+    }
+
+
+def iter_comparisons(decisions: Iterable[Decision], batch_size: int = DEFAULT_BATCH_SIZE,
+                     workers: int = 1, master_seed: int = 0, **ai_options) -> Iterator[Dict]:
+    """
+    Re-evaluate `decisions` batch by batch and yield one comparison per decision,
+    in input order. With workers > 1 at most 2 * workers batches are in flight,
+    so the input is still consumed lazily.
+    """
+    batches = enumerate(batched(decisions, batch_size))
+    if workers <= 1:
+        for index, batch in batches:
+            results = evaluate_batch([d.state for d in batch], batch_seed(master_seed, index), ai_options)
+            yield from map(compare, batch, results)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for index, batch in batches:
+            pending.append((batch, pool.submit(evaluate_batch, [d.state for d in batch],
+                                               batch_seed(master_seed, index), ai_options)))
+            if len(pending) >= 2 * workers:
+                batch, future = pending.popleft()
+                yield from map(compare, batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            yield from map(compare, batch, future.result())
+
+
+def replay(history_path: str, output_path: str, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1,
+           master_seed: int = 0, **ai_options) -> Dict[str, float]:
+    """
+    Replay a history file and write its comparisons to `output_path`.
+    Returns the decision count, the agreement rate and, over decisions where the
+    search valued both actions, the mean EV of the agent's action minus the recorded one.
+    """
+    decisions = agreed = valued = 0
+    ev_gap = 0.0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        comparisons = iter_comparisons(iter_decisions(read_history(history_path)), batch_size, workers,
+                                       master_seed, **ai_options)
+        for comparison in comparisons:
+            f.write(json.dumps(comparison, separators=(',', ':')) + '\n')
+            decisions += 1
+            agreed += comparison['agree']
+            if comparison['ev_ai'] is not None and comparison['ev_recorded'] is not None:
+                valued += 1
+                ev_gap += comparison['ev_ai'] - comparison['ev_recorded']
+    return {
+        'decisions': decisions,
+        'agreement': agreed / decisions if decisions else 0.0,
+        'mean_ev_gap': ev_gap / valued if valued else 0.0,
+        'valued': valued,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Re-evaluate recorded decisions with the current agent.")
+    parser.add_argument('history', help="hand-history JSONL file")
+    parser.add_argument('--output', default='replay.jsonl', help="per-decision comparisons (default: replay.jsonl)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0, help="master seed of the agent's searches")
+    parser.add_argument('--iterations', type=int, default=500, help="MCTS iterations per decision")
+    parser.add_argument('--policy-table', help="answer covered states from this policy table")
+    parser.add_argument('--track-range', action='store_true', help="search against a Bayesian opponent range")
+    args = parser.parse_args(argv)
+
+    summary = replay(args.history, args.output, args.batch_size, args.workers, args.seed,
+                     iterations=args.iterations, policy_table=args.policy_table, track_range=args.track_range)
+    print(f"{summary['decisions']} decisions, agreement {summary['agreement']:.1%}, "
+          f"mean EV gain over recorded actions {summary['mean_ev_gap']:+.3f} "
+          f"({summary['valued']} searched decisions)")
+    print(f"Comparisons written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
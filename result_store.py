@@ -0,0 +1,114 @@
+"""
+On-disk cache of strategy-matchup results.
+
+Each finished pair is appended to a JSON Lines file as soon as it is done, so
+an interrupted sweep resumes where it stopped. A cell is keyed by a hash of
+everything its tally depends on: both strategies' compiled probability tables
+(so editing a strategy invalidates exactly its cells), the rules, the game
+count, the seeding and the game parameters. Re-runs only compute missing or
+changed cells.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from batch_simulator import MATRIX_RULES, Rules
+from parallel_runner import Counts, Pair, iter_matchups
+
+
+def table_fingerprint(table: np.ndarray) -> str:
+    """Hash of a strategy's probability table"""
+    table = np.ascontiguousarray(table, dtype=np.float64)
+    digest = hashlib.sha256(str(table.shape).encode())
+    digest.update(table.tobytes())
+    return digest.hexdigest()
+
+
+def cell_key(pair: Pair, tables: Dict[str, np.ndarray], params: Dict) -> str:
+    """Cache key of one matchup under `params`"""
+    payload = {
+        'pair': list(pair),
+        'tables': [table_fingerprint(tables[pair[0]]), table_fingerprint(tables[pair[1]])],
+        'params': params,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class ResultStore:
+    """Append-only JSON Lines file of {key, pair, counts} records, indexed in memory by key"""
+    def __init__(self, path: str):
+        self.path = path
+        self.records: Dict[str, Dict] = {}
+        self._torn = False  # Last line has no newline, so the next record must start a new one
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            self._torn = bool(text) and not text.endswith('\n')
+            for line in text.splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash; that cell is simply recomputed
+                    continue
+                self.records[record['key']] = record
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, key: str) -> Optional[Counts]:
+        record = self.records.get(key)
+        return None if record is None else tuple(record['counts'])
+
+    def put(self, key: str, pair: Pair, counts: Counts) -> None:
+        """Record one cell and flush it to disk before returning"""
+        record = {'key': key, 'pair': list(pair), 'counts': [int(n) for n in counts]}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(('\n' if self._torn else '') + json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._torn = False
+        self.records[key] = record
+
+
+def cached_matchups(pairs: Sequence[Pair], tables: Dict[str, np.ndarray], num_games: int,
+                    store: Union[str, ResultStore], rules: Rules = MATRIX_RULES, master_seed: int = 0,
+                    chunk_size: int = 2500, starting_coins: int = 5, max_rounds: int = 1000,
+                    target_width: Optional[float] = None, **kwargs) -> Iterator[Tuple[int, Pair, Counts]]:
+    """
+    iter_matchups with a result cache: cached cells are yielded first, the rest
+    are simulated and checkpointed to `store` one pair at a time. Because every
+    chunk is seeded from master_seed and the pair, a resumed sweep gives the
+    same table as an uninterrupted one.
+    """
+    if not isinstance(store, ResultStore):
+        store = ResultStore(store)
+    params = {'rules': list(rules), 'num_games': num_games, 'master_seed': master_seed,
+              'chunk_size': chunk_size, 'starting_coins': starting_coins, 'max_rounds': max_rounds}
+    if target_width is not None:
+        # Only adaptive sweeps carry the key, so fixed-size cells keep their existing keys
+        params['target_width'] = target_width
+    keys = [cell_key(pair, tables, params) for pair in pairs]
+
+    missing = []
+    for index, pair in enumerate(pairs):
+        counts = store.get(keys[index])
+        if counts is None:
+            missing.append(index)
+        else:
+            yield index, pair, counts
+    if not missing:
+        return
+
+    for position, pair, counts in iter_matchups([pairs[i] for i in missing], tables, num_games, rules,
+                                                master_seed=master_seed, chunk_size=chunk_size,
+                                                starting_coins=starting_coins, max_rounds=max_rounds,
+                                                target_width=target_width, **kwargs):
+        index = missing[position]
+        store.put(keys[index], pair, counts)
+        yield index, pair, counts
@@ -0,0 +1,265 @@
+"""
+Shared registry of the strategies played in the abstract analysis game
+(zhajinhua_visulization.py and zhajinhua_visulization_agent.py).
+
+A strategy maps (hand_strength, coins) to an action. Every strategy is also
+compiled once into a table so the batch simulator and the Markov solver can
+evaluate it by array indexing: deterministic strategies become an action-id
+array [coins, hand_strength], stochastic ones a probability table
+[coins, hand_strength, action].
+"""
+import random
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from batch_simulator import NUM_HAND_STRENGTHS, mix_tables, uniform_table
+from cards import ACTIONS
+
+Strategy = Callable[[int, int], str]
+
+# Define strategies
+def conservative_strategy(hand_strength, player_coins):
+    """
+    Conservative Strategy:
+    - Fold if hand strength is below 5.
+    - Bet 1 coin if hand_strength between 5 and 9.
+    - Bet 2 coins if hand_strength is 10.
+    """
+    if hand_strength < 5:
+        return 'fold'
+    elif 5 <= hand_strength <= 9:
+        return 'bet1'
+    else:
+        return 'bet2'
+
+def aggressive_strategy(hand_strength, player_coins):
+    """
+    Aggressive Strategy:
+    - Fold if hand strength is 0.
+    - Bet 1 coin if hand_strength between 1 and 4.
+    - Bet 2 coins if hand_strength is 5 or above.
+    """
+    if hand_strength < 1:
+        return 'fold'
+    elif 1 <= hand_strength < 5:
+        return 'bet1'
+    else:
+        return 'bet2'
+
+def moderate_strategy(hand_strength, player_coins):
+    """
+    Moderate Strategy:
+    - Fold if hand strength is below 4.
+    - Bet 1 coin if hand_strength between 4 and 7.
+    - Bet 2 coins if hand_strength is 8 or above.
+    """
+    if hand_strength < 4:
+        return 'fold'
+    elif 4 <= hand_strength <= 7:
+        return 'bet1'
+    else:
+        return 'bet2'
+
+def random_strategy(hand_strength, player_coins):
+    """
+    Random Strategy:
+    - Randomly choose to fold, bet 1, or bet 2 coins.
+    """
+    return random.choice(['fold', 'bet1', 'bet2'])
+
+
+# Define the AI strategy that transitions from conservative to moderate
+def ai_strategy(hand_strength, player_coins):
+    """
+    AI Strategy:
+    - Conservative when coins <= 3
+    - Moderate when coins > 3
+    """
+    if player_coins <= 3:
+        # Conservative logic
+        if hand_strength < 7:
+            return 'fold'
+        elif 7 <= hand_strength <= 9:
+            return 'bet1'
+        else:
+            return 'bet2'
+    else:
+        # Moderate logic
+        if hand_strength < 5:
+            return 'fold'
+        elif 5 <= hand_strength <= 8:
+            return 'bet1'
+        else:
+            return 'bet2'
+
+# Composite opponent strategies
+def aggressive_moderate_strategy(hand_strength, player_coins):
+    """Aggressive when coins >= 5, Moderate otherwise"""
+    if player_coins >= 5:
+        return aggressive_strategy(hand_strength, player_coins)
+    else:
+        return moderate_strategy(hand_strength, player_coins)
+
+def aggressive_conservative_strategy(hand_strength, player_coins):
+    """Aggressive when coins >= 5, Conservative otherwise"""
+    if player_coins >= 5:
+        return aggressive_strategy(hand_strength, player_coins)
+    else:
+        return conservative_strategy(hand_strength, player_coins)
+
+def conservative_aggressive_strategy(hand_strength, player_coins):
+    """Conservative when coins <= 5, Aggressive otherwise"""
+    if player_coins <= 5:
+        return conservative_strategy(hand_strength, player_coins)
+    else:
+        return aggressive_strategy(hand_strength, player_coins)
+
+def moderate_aggressive_strategy(hand_strength, player_coins):
+    """Moderate when coins <= 5, Aggressive otherwise"""
+    if player_coins <= 5:
+        return moderate_strategy(hand_strength, player_coins)
+    else:
+        return aggressive_strategy(hand_strength, player_coins)
+
+def adaptive_aggressive_strategy(hand_strength, player_coins):
+    """Adapts aggression based on coin count"""
+    if player_coins >= 7:
+        # Very aggressive
+        if hand_strength < 1:
+            return 'fold'
+        else:
+            return 'bet2'
+    elif player_coins >= 4:
+        # Moderately aggressive
+        if hand_strength < 2:
+            return 'fold'
+        elif hand_strength < 6:
+            return 'bet1'
+        else:
+            return 'bet2'
+    else:
+        # Conservative
+        return conservative_strategy(hand_strength, player_coins)
+
+def cyclic_strategy(hand_strength, player_coins):
+    """Cycles between aggressive, moderate, and conservative based on coins"""
+    coin_cycle = player_coins % 3
+    if coin_cycle == 0:
+        return aggressive_strategy(hand_strength, player_coins)
+    elif coin_cycle == 1:
+        return moderate_strategy(hand_strength, player_coins)
+    else:
+        return conservative_strategy(hand_strength, player_coins)
+
+def balanced_strategy(hand_strength, player_coins):
+    """Balances between strategies based on hand strength and coins"""
+    if player_coins <= 3:
+        if hand_strength < 3:
+            return 'fold'
+        elif hand_strength < 7:
+            return 'bet1'
+        else:
+            return 'bet2'
+    else:
+        if hand_strength < 4:
+            return 'fold'
+        elif hand_strength < 8:
+            return 'bet1'
+        else:
+            return 'bet2'
+
+def risky_conservative_strategy(hand_strength, player_coins):
+    """Conservative with occasional high-risk plays"""
+    if random.random() < 0.2:  # 20% chance of aggressive play
+        return aggressive_strategy(hand_strength, player_coins)
+    else:
+        return conservative_strategy(hand_strength, player_coins)
+
+def progressive_strategy(hand_strength, player_coins):
+    """Becomes more aggressive as coins increase"""
+    aggression_threshold = min(player_coins / 10, 1)  # Scale with coins
+    if random.random() < aggression_threshold:
+        return aggressive_strategy(hand_strength, player_coins)
+    else:
+        return moderate_strategy(hand_strength, player_coins)
+
+def coin_aware_strategy(hand_strength, player_coins):
+    """Adapts strategy based on exact coin count"""
+    if player_coins <= 2:
+        return conservative_strategy(hand_strength, player_coins)
+    elif player_coins <= 4:
+        return moderate_strategy(hand_strength, player_coins)
+    elif player_coins <= 6:
+        return aggressive_strategy(hand_strength, player_coins)
+    else:
+        return balanced_strategy(hand_strength, player_coins)
+
+
+# Every strategy by name; 'AI' is the agent module's ai_strategy
+STRATEGIES: Dict[str, Strategy] = {
+    'AI': ai_strategy,
+    'Conservative': conservative_strategy,
+    'Aggressive': aggressive_strategy,
+    'Moderate': moderate_strategy,
+    'Random': random_strategy,
+    'Aggressive-Moderate': aggressive_moderate_strategy,
+    'Aggressive-Conservative': aggressive_conservative_strategy,
+    'Conservative-Aggressive': conservative_aggressive_strategy,
+    'Moderate-Aggressive': moderate_aggressive_strategy,
+    'Adaptive-Aggressive': adaptive_aggressive_strategy,
+    'Cyclic': cyclic_strategy,
+    'Balanced': balanced_strategy,
+    'Risky-Conservative': risky_conservative_strategy,
+    'Progressive': progressive_strategy,
+    'Coin-Aware': coin_aware_strategy
+}
+
+# The 8 strategies of the strategy-vs-strategy matrix
+MATRIX_STRATEGIES = ('Conservative', 'Aggressive', 'Moderate', 'Random', 'Aggressive-Moderate',
+                     'Aggressive-Conservative', 'Conservative-Aggressive', 'Moderate-Aggressive')
+# The 14 opponents the AI strategy is evaluated against
+OPPONENT_STRATEGIES = MATRIX_STRATEGIES + ('Adaptive-Aggressive', 'Cyclic', 'Balanced', 'Risky-Conservative',
+                                           'Progressive', 'Coin-Aware')
+
+# Stochastic strategies as (first, second, P(first) given coins); Random is handled as uniform
+MIXTURES: Dict[str, Tuple[str, str, Callable[[int], float]]] = {
+    'Risky-Conservative': ('Aggressive', 'Conservative', lambda coins: 0.2),
+    'Progressive': ('Aggressive', 'Moderate', lambda coins: min(coins / 10, 1)),
+}
+STOCHASTIC = frozenset(MIXTURES) | {'Random'}
+
+
+def is_deterministic(name: str) -> bool:
+    return name not in STOCHASTIC
+
+
+@lru_cache(maxsize=None)
+def action_table(name: str, max_coins: int = 10) -> np.ndarray:
+    """
+    Action ids (indices into ACTIONS) of a deterministic strategy, shape
+    (max_coins + 1, 11), built by calling the strategy once per cell.
+    """
+    if not is_deterministic(name):
+        raise ValueError(f"{name!r} is stochastic; use probability_table")
+    strategy = STRATEGIES[name]
+    table = np.array([[ACTIONS.index(strategy(hand_strength, coins)) for hand_strength in range(NUM_HAND_STRENGTHS)]
+                      for coins in range(max_coins + 1)], dtype=np.int8)
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def probability_table(name: str, max_coins: int = 10) -> np.ndarray:
+    """Probability table [coins, hand_strength, action] of any registered strategy"""
+    if name == 'Random':
+        table = uniform_table(max_coins)
+    elif name in MIXTURES:
+        first, second, weight = MIXTURES[name]
+        weights = [weight(coins) for coins in range(max_coins + 1)]
+        table = mix_tables(probability_table(first, max_coins), probability_table(second, max_coins), weights)
+    else:
+        table = np.eye(len(ACTIONS))[action_table(name, max_coins)]
+    table.setflags(write=False)
+    return table
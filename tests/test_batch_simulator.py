@@ -0,0 +1,69 @@
+"""The lockstep batch simulator against a game played round by round"""
+import random
+
+import numpy as np
+
+from batch_simulator import AGENT_RULES, MATRIX_RULES, NUM_HAND_STRENGTHS, simulate_games_batch
+
+MAX_COINS = 10
+
+
+def threshold_table(fold_below, bet2_from):
+    """Deterministic probability table: fold, bet1 or bet2 by hand strength"""
+    actions = [0 if hand < fold_below else 2 if hand >= bet2_from else 1 for hand in range(NUM_HAND_STRENGTHS)]
+    return np.repeat(np.eye(3)[actions][np.newaxis], MAX_COINS + 1, axis=0)
+
+
+CONSERVATIVE = threshold_table(5, 10)
+AGGRESSIVE = threshold_table(1, 5)
+
+
+def reference_game(player_table, opponent_table, rng, starting_coins=5, max_rounds=1000):
+    """One game under MATRIX_RULES, a round at a time like simulate_round in zhajinhua_visulization.py"""
+    player_coins = opponent_coins = starting_coins
+    for _ in range(max_rounds):
+        if player_coins <= 0 or opponent_coins <= 0:
+            break
+        player_hand, opponent_hand = rng.randint(0, 10), rng.randint(0, 10)
+        player_action = int(np.argmax(player_table[min(player_coins, MAX_COINS), player_hand]))
+        opponent_action = int(np.argmax(opponent_table[min(opponent_coins, MAX_COINS), opponent_hand]))
+        player_bet = min(player_action, player_coins)
+        opponent_bet = opponent_action
+        player_coins -= player_bet
+        opponent_coins -= opponent_bet
+        if player_action and opponent_action:
+            if player_hand > opponent_hand:
+                player_coins += player_bet + opponent_bet
+            elif opponent_hand > player_hand:
+                opponent_coins += player_bet + opponent_bet
+            else:
+                player_coins += player_bet
+                opponent_coins += opponent_bet
+    if player_coins > 0 and opponent_coins == 0:
+        return 0
+    if opponent_coins > 0 and player_coins == 0:
+        return 1
+    return 2
+
+
+def test_counts_cover_every_game_and_are_seeded():
+    first = simulate_games_batch(CONSERVATIVE, AGGRESSIVE, 1000, rng=np.random.default_rng(5))
+    assert sum(first) == 1000
+    assert first == simulate_games_batch(CONSERVATIVE, AGGRESSIVE, 1000, rng=np.random.default_rng(5))
+
+
+def test_batch_matches_round_by_round_games():
+    games = 4000
+    rng = random.Random(0)
+    reference = np.bincount([reference_game(CONSERVATIVE, AGGRESSIVE, rng) for _ in range(games)], minlength=3)
+    batch = simulate_games_batch(CONSERVATIVE, AGGRESSIVE, games, MATRIX_RULES, rng=np.random.default_rng(0))
+    for expected, observed in zip(reference / games, np.array(batch) / games):
+        pooled = (expected + observed) / 2
+        assert abs(expected - observed) <= 4 * np.sqrt(2 * pooled * (1 - pooled) / games) + 1e-9
+
+
+def test_identical_strategies_are_symmetric_under_agent_rules():
+    games = 20000
+    wins, losses, draws = simulate_games_batch(AGGRESSIVE, AGGRESSIVE, games, AGENT_RULES,
+                                               rng=np.random.default_rng(1))
+    assert abs(wins - losses) <= 4 * np.sqrt(wins + losses)
@@ -0,0 +1,78 @@
+"""The 3-card lookup tables against the scoring logic they replaced"""
+from itertools import combinations
+
+from cards import (HAND_ORDINALS, HAND_SCORES, HANDS, NUM_CARDS, NUM_HANDS, RANK_NAMES, SUITS, card_rank,
+                   card_suit, encode_hand, hand_index, hand_ordinal, hand_score)
+
+FILE_RANKS = {value: name for name, value in RANK_NAMES.items()}
+
+
+def card_path(card):
+    return f"./PNG-cards-1.3/{FILE_RANKS[card_rank(card)]}_of_{SUITS[card_suit(card)]}.png"
+
+
+def original_score(hand):
+    """calculate_score as it was in MCTS_agent.py before the tables, minus its debug prints"""
+    cards = []
+    for card_path in hand:
+        parts = card_path.split('/')[-1].split('.')[0].split('_')
+        rank = parts[0]
+        cards.append((RANK_NAMES.get(rank.lower(), int(rank) if rank.isdigit() else 0), parts[-1]))
+    cards.sort(reverse=True)
+    values = [card[0] for card in cards]
+    suits = [card[1] for card in cards]
+
+    if len(set(values)) == 1:
+        return 7, max(values)
+    is_flush = len(set(suits)) == 1
+    is_straight = False
+    straight_value = 0
+    if set(values) == {14, 2, 3}:
+        is_straight = True
+        straight_value = 3
+    elif max(values) - min(values) == 2 and len(set(values)) == 3:
+        is_straight = True
+        straight_value = max(values)
+    if is_straight and is_flush:
+        return 6, straight_value or max(values)
+    if is_flush:
+        return 5, max(values)
+    if is_straight:
+        return 4, straight_value or max(values)
+    if len(set(values)) == 2:
+        for value in values:
+            if values.count(value) == 2:
+                return 3, value
+    return 2, max(values)
+
+
+def test_tables_cover_every_hand_once():
+    indices = sorted(hand_index(*hand) for hand in combinations(range(NUM_CARDS), 3))
+    assert indices == list(range(NUM_HANDS))
+    assert all(hand_index(*HANDS[i]) == i for i in range(NUM_HANDS))
+
+
+def test_scores_match_original_logic():
+    for i, hand in enumerate(HANDS):
+        paths = [card_path(card) for card in hand]
+        expected = original_score(paths)
+        assert HAND_SCORES[i] == expected, paths
+        assert hand_score(paths) == expected
+        assert hand_score(reversed(hand)) == expected
+        assert encode_hand(paths) == tuple(hand)
+
+
+def test_ordinals_refine_scores():
+    # A higher (type, high card) score never has a lower ordinal
+    order = sorted(range(NUM_HANDS), key=lambda i: (HAND_SCORES[i], HAND_ORDINALS[i]))
+    ordinals = [HAND_ORDINALS[i] for i in order]
+    assert ordinals == sorted(ordinals)
+
+
+def test_fallback_paths_still_score():
+    # Duplicate art and jokers are outside the table but were scored before it
+    paths = ['./PNG-cards-1.3/king_of_hearts2.png', './PNG-cards-1.3/king_of_spades.png',
+             './PNG-cards-1.3/2_of_clubs.png']
+    assert hand_score(paths) == original_score(paths) == (3, 13)
+    assert hand_ordinal(paths) == hand_ordinal([card_path(c) for c in (44, 47, 0)])
+    assert hand_score(['./PNG-cards-1.3/red_joker.png']) == original_score(['./PNG-cards-1.3/red_joker.png'])
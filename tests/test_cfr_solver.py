@@ -0,0 +1,39 @@
+"""Mapping of game states onto the solved CFR tree"""
+import numpy as np
+import pytest
+
+from MCTS_agent import ZhaJinHuaState
+from cards import hand_ordinal
+from cfr_solver import solve_cfr
+
+HAND = [20, 33, 46]
+
+
+@pytest.fixture(scope='module')
+def policy():
+    return solve_cfr(num_buckets=4, iterations=50)
+
+
+def test_dealer_opening_uses_the_opening_strategy(policy):
+    state = ZhaJinHuaState(HAND, 5, 5, 0, 0, True)
+    probabilities = policy.action_probabilities(state)
+    assert probabilities.sum() == pytest.approx(1.0)
+    # Stacks are capped at MAX_COINS = 2
+    np.testing.assert_array_equal(probabilities, policy.first[2, 2, policy.buckets[hand_ordinal(HAND)]])
+
+
+def test_non_dealer_response_uses_the_response_strategy(policy):
+    state = ZhaJinHuaState(HAND, 1, 3, 0, 2, False)
+    # Indexed by the dealer's stack before its opening bet of 2, then ours
+    np.testing.assert_array_equal(policy.action_probabilities(state),
+                                  policy.second[2, 1, 2, policy.buckets[hand_ordinal(HAND)]])
+
+
+@pytest.mark.parametrize('state', [
+    ZhaJinHuaState(HAND, 5, 5, 0, 0, False),  # Non-dealer asked before the dealer has opened
+    ZhaJinHuaState(HAND, 5, 4, 0, 1, True),   # Dealer facing a bet it never sees in the tree
+    ZhaJinHuaState(HAND, 4, 5, 1, 0, True),   # Already holding a bet
+])
+def test_states_outside_the_tree_are_not_answered(policy, state):
+    assert policy.action_probabilities(state) is None
+    assert policy.get_action(state) is None
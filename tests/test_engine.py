@@ -0,0 +1,178 @@
+"""Rules of the headless engine: betting, folds, showdowns, dealer rotation and game end"""
+import random
+
+import pytest
+
+from hand_history import HandHistory, read_history
+from zhajinhua_engine import OPPONENT, PLAYER, Event, Policy, RandomPolicy, ZhaJinHuaEngine, ZhaJinHuaSimulator
+
+# card = (rank - 2) * 4 + suit, suits clubs, diamonds, hearts, spades
+ACES = [48, 49, 50]          # Three of a kind
+LOW = [0, 13, 30]            # 2c 5d 9h, high card
+LOW_OTHER_SUITS = [1, 14, 31]  # 2d 5h 9s, ties LOW
+
+
+class FixedDeal(ZhaJinHuaSimulator):
+    """Deals the same hands to the same seats every round"""
+    def __init__(self, player_hand, opponent_hand, dealer=PLAYER):
+        super().__init__(random.Random(0))
+        self.Dealer = dealer
+        self.hands = (player_hand, opponent_hand)
+
+    def deal_hands(self, hand_num=3):
+        self.player_hand, self.opponent_hand = list(self.hands[0]), list(self.hands[1])
+        return self.player_hand, self.opponent_hand
+
+
+class Script(Policy):
+    """Plays the given actions in order"""
+    def __init__(self, *actions):
+        self.actions = list(actions)
+
+    def choose_action(self, state):
+        return self.actions.pop(0)
+
+
+def new_engine(player_hand=ACES, opponent_hand=LOW, dealer=PLAYER, starting_coins=5, history=None):
+    engine = ZhaJinHuaEngine(starting_coins, FixedDeal(player_hand, opponent_hand, dealer), history=history)
+    engine.start_round()
+    return engine
+
+
+def test_dealer_acts_first_and_sees_its_own_view():
+    engine = new_engine(dealer=OPPONENT)
+    assert engine.to_act == OPPONENT
+    state = engine.observe(OPPONENT)
+    assert list(state.player_hand) == LOW
+    assert (state.player_coins, state.opponent_coins, state.is_dealer) == (5, 5, True)
+    assert not engine.observe(PLAYER).is_dealer
+
+
+def test_bet_and_call_go_to_showdown():
+    engine = new_engine()
+    assert engine.step('bet1') == [Event('bet', PLAYER, 1)]
+    assert (engine.to_act, engine.coins, engine.pot) == (OPPONENT, [4, 5], 1)
+    events = engine.step('bet1')
+    assert events == [Event('bet', OPPONENT, 1), Event('showdown', OPPONENT, pot=2, winner=PLAYER)]
+    assert engine.coins == [6, 4]
+    assert engine.round_over and not engine.game_over
+
+
+def test_call_is_raised_to_the_amount_owed():
+    engine = new_engine()
+    engine.step('bet2')
+    events = engine.step('bet1')
+    assert events[0] == Event('bet', OPPONENT, 2)
+    assert events[1] == Event('showdown', OPPONENT, pot=4, winner=PLAYER)
+    assert engine.coins == [7, 3]
+
+
+def test_fold_pays_the_pot_to_the_other_seat():
+    engine = new_engine()
+    engine.step('bet2')
+    assert engine.step('fold') == [Event('fold', OPPONENT, pot=2, winner=PLAYER)]
+    assert engine.coins == [5, 5]
+    assert engine.bets == [0, 0] and engine.round_over
+
+
+def test_opening_fold_costs_nothing():
+    engine = new_engine(dealer=OPPONENT)
+    assert engine.step('fold') == [Event('fold', OPPONENT, pot=0, winner=PLAYER)]
+    assert engine.coins == [5, 5]
+
+
+def test_bet_that_cannot_be_covered_is_a_fold():
+    engine = new_engine()
+    engine.coins[OPPONENT] = 1
+    engine.step('bet2')
+    # Calling needs 2 coins, so even bet1 ends the round as a fold
+    assert engine.step('bet1') == [Event('fold', OPPONENT, pot=2, winner=PLAYER)]
+    assert engine.coins == [5, 1]
+    assert not engine.game_over
+
+
+def test_showdown_tie_returns_the_bets():
+    engine = new_engine(LOW, LOW_OTHER_SUITS)
+    engine.step('bet2')
+    events = engine.step('bet2')
+    assert events[-1] == Event('showdown', OPPONENT, pot=4, winner=None)
+    assert engine.coins == [5, 5]
+
+
+def test_dealer_button_passes_every_round():
+    engine = new_engine()
+    dealers = []
+    for _ in range(4):
+        dealers.append(engine.dealer)
+        assert engine.to_act == engine.dealer
+        engine.step('fold')
+        engine.start_round()
+    assert dealers == [PLAYER, OPPONENT, PLAYER, OPPONENT]
+
+
+def test_game_ends_when_a_stack_is_empty():
+    engine = new_engine(starting_coins=2)
+    engine.step('bet2')
+    engine.step('bet2')
+    assert engine.coins == [4, 0]
+    assert engine.game_over
+    with pytest.raises(RuntimeError):
+        engine.start_round()
+    engine.reset()
+    assert engine.coins == [2, 2] and not engine.game_over
+
+
+def test_step_rejects_bad_calls():
+    engine = new_engine()
+    with pytest.raises(ValueError):
+        engine.step('raise')
+    engine.step('fold')
+    with pytest.raises(RuntimeError):
+        engine.step('bet1')
+
+
+def test_play_game_reports_the_winner():
+    engine = ZhaJinHuaEngine(2, FixedDeal(ACES, LOW))
+    assert engine.play_game([Script('bet2'), Script('bet2')]) == PLAYER
+    assert engine.round_number == 1
+    # Two seats that always fold never finish
+    folding = Script(*['fold'] * 10)
+    assert engine.play_game([folding, folding], max_rounds=10) is None
+
+
+def test_seeded_games_are_reproducible():
+    def tally(seed):
+        rng = random.Random(seed)
+        engine = ZhaJinHuaEngine(seed=seed)
+        return engine.play_games([RandomPolicy(rng), RandomPolicy(rng)], 50)
+    results = tally(1)
+    assert results == tally(1)
+    assert sum(results.values()) == 50
+
+
+def test_rounds_are_recorded_to_the_history(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    with HandHistory(path, batch_size=2) as history:
+        engine = new_engine(history=history)
+        engine.step('bet2')
+        engine.step('bet1')
+        engine.start_round()
+        engine.step('fold')
+        assert history.written == 2
+        engine.coins[PLAYER] = 1
+        engine.start_round()
+        engine.step('bet2')
+    records = list(read_history(path))
+    assert records[0] == {
+        'round': 1, 'dealer': PLAYER, 'coins': [5, 5], 'hands': [ACES, LOW],
+        'actions': [[PLAYER, 'bet2', 2], [OPPONENT, 'bet1', 2]],
+        'result': {'kind': 'showdown', 'winner': PLAYER, 'pot': 4}, 'final_coins': [7, 3],
+    }
+    assert records[1]['dealer'] == OPPONENT
+    assert records[1]['actions'] == [[OPPONENT, 'fold', 0]]
+    assert records[1]['result'] == {'kind': 'fold', 'winner': PLAYER, 'pot': 0}
+    # A bet the seat can't cover is recorded as asked for, with no coins put in
+    assert records[2]['coins'] == [1, 3]
+    assert records[2]['actions'] == [[PLAYER, 'bet2', 0]]
+    assert records[2]['result']['winner'] == OPPONENT
+    assert len(records) == 3
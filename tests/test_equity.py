@@ -0,0 +1,76 @@
+"""Exact showdown equities and the Bayesian opponent range"""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from cards import HAND_ORDINALS, HANDS, NUM_CARDS, NUM_HANDS, hand_index
+from equity import OpponentRange, action_likelihoods, blocked_hands, equity_by_index, showdown_equity
+
+
+def test_equities_sum_to_one():
+    for index in range(NUM_HANDS):
+        assert sum(equity_by_index(index)) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('hand', [(0, 4, 9), (44, 45, 46), (48, 49, 50), (0, 5, 50)])
+def test_equity_matches_enumeration(hand):
+    ours = HAND_ORDINALS[hand_index(*hand)]
+    deck = [card for card in range(NUM_CARDS) if card not in hand]
+    outcomes = [0, 0, 0]
+    for other in combinations(deck, 3):
+        theirs = HAND_ORDINALS[hand_index(*other)]
+        outcomes[0 if ours > theirs else 1 if ours == theirs else 2] += 1
+    total = sum(outcomes)
+    assert showdown_equity(hand) == pytest.approx(tuple(n / total for n in outcomes))
+
+
+def test_best_and_worst_hands():
+    aces = hand_index(49, 50, 51)
+    assert equity_by_index(aces)[2] == 0.0
+    worst = min(range(NUM_HANDS), key=HAND_ORDINALS.__getitem__)
+    assert equity_by_index(worst)[0] == 0.0
+    assert showdown_equity(HANDS[aces]) == equity_by_index(aces)
+
+
+def test_rejects_hands_outside_the_table():
+    with pytest.raises(ValueError):
+        showdown_equity([0, 0, 1])
+
+
+def test_uniform_range_matches_exact_equity():
+    hand = (20, 33, 46)
+    opponent_range = OpponentRange(hand)
+    index = hand_index(*hand)
+    assert opponent_range.equity() == pytest.approx(equity_by_index(index))
+    assert opponent_range.weights[blocked_hands(index)].sum() == 0.0
+
+
+def test_observations_keep_the_range_normalised():
+    opponent_range = OpponentRange((20, 33, 46))
+    for amount, min_bet in ((1, 1), (2, 2), (0, 1)):
+        opponent_range.observe(amount, min_bet)
+        assert opponent_range.weights.sum() == pytest.approx(1.0)
+        assert sum(opponent_range.equity()) == pytest.approx(1.0)
+        assert opponent_range.action_probabilities().sum() == pytest.approx(1.0)
+    assert opponent_range.observed_bet == 3
+
+
+def test_bets_narrow_the_range_towards_strong_hands():
+    opponent_range = OpponentRange((20, 33, 46))
+    before = opponent_range.value()
+    predicted = opponent_range.value_after(2)
+    assert opponent_range.value() == before  # Looking ahead leaves the range alone
+    opponent_range.observe(2)
+    assert opponent_range.value() == pytest.approx(predicted)
+    assert opponent_range.value() < before
+    opponent_range.reset((20, 33, 46))
+    assert opponent_range.value() == pytest.approx(before)
+
+
+def test_uninformative_likelihoods_learn_nothing():
+    opponent_range = OpponentRange((20, 33, 46), action_likelihoods(0.0))
+    before = opponent_range.equity()
+    opponent_range.observe(2)
+    assert opponent_range.equity() == pytest.approx(before)
+    assert np.allclose(opponent_range.action_probabilities(), 1 / 3)
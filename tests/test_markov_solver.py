@@ -0,0 +1,40 @@
+"""The exact Markov-chain solver against the batch simulator"""
+import numpy as np
+import pytest
+
+from batch_simulator import AGENT_RULES, MATRIX_RULES, NUM_HAND_STRENGTHS, simulate_games_batch, uniform_table
+from markov_solver import solve_matchup
+
+
+def threshold_table(fold_below, bet2_from, max_coins=10):
+    actions = [0 if hand < fold_below else 2 if hand >= bet2_from else 1 for hand in range(NUM_HAND_STRENGTHS)]
+    return np.repeat(np.eye(3)[actions][np.newaxis], max_coins + 1, axis=0)
+
+
+TABLES = {'Conservative': threshold_table(5, 10), 'Aggressive': threshold_table(1, 5),
+          'Moderate': threshold_table(4, 8), 'Random': uniform_table(10)}
+PAIRS = [('Conservative', 'Aggressive'), ('Moderate', 'Random'), ('Aggressive', 'Moderate')]
+
+
+@pytest.mark.parametrize('rules', [MATRIX_RULES, AGENT_RULES])
+@pytest.mark.parametrize('pair', PAIRS)
+def test_batch_agrees_with_markov(pair, rules):
+    player_table, opponent_table = TABLES[pair[0]], TABLES[pair[1]]
+    exact = solve_matchup(player_table, opponent_table, rules)
+    assert sum(exact) == pytest.approx(1.0)
+    games = 20000
+    sampled = simulate_games_batch(player_table, opponent_table, games, rules, rng=np.random.default_rng(0))
+    # Three standard errors: with twelve cases a 95% band would fail for about half of all seeds
+    for p, count in zip(exact, sampled):
+        assert abs(count / games - p) <= 3 * np.sqrt(p * (1 - p) / games) + 1e-9
+
+
+def test_round_cap_converges_to_the_unbounded_game():
+    capped = solve_matchup(TABLES['Conservative'], TABLES['Aggressive'], max_rounds=1000)
+    assert capped == pytest.approx(solve_matchup(TABLES['Conservative'], TABLES['Aggressive'], max_rounds=None))
+
+
+@pytest.mark.parametrize('rules', [MATRIX_RULES, AGENT_RULES])
+def test_seats_that_always_fold_draw(rules):
+    folding = threshold_table(NUM_HAND_STRENGTHS, NUM_HAND_STRENGTHS)
+    assert solve_matchup(folding, folding, rules, max_rounds=None) == pytest.approx((0.0, 0.0, 1.0))
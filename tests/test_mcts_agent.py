@@ -0,0 +1,65 @@
+"""Showdown rewards, opponent-range tracking and profiling of the MCTS agent"""
+import pytest
+
+import MCTS_agent
+from MCTS_agent import MCTS, ZhaJinHuaAI, ZhaJinHuaScoreCalculator, ZhaJinHuaState
+from equity import showdown_equity
+
+# Jokers, and a card dealt twice through its duplicate art, are not in the 3-card table
+KINGS_WITH_DUPLICATE_ART = ['./PNG-cards-1.3/king_of_hearts2.png', './PNG-cards-1.3/king_of_hearts.png',
+                            './PNG-cards-1.3/king_of_spades.png']
+PAIR_WITH_JOKER = ['./PNG-cards-1.3/king_of_hearts.png', './PNG-cards-1.3/king_of_spades.png',
+                   './PNG-cards-1.3/red_joker.png']
+
+
+def showdown(hand):
+    """A state where both seats have bet, so the next reward is the showdown value"""
+    return ZhaJinHuaState(hand, 4, 4, 1, 1, True)
+
+
+def test_table_hands_are_rewarded_with_exact_equity():
+    mcts = MCTS(ZhaJinHuaScoreCalculator(), seed=0)
+    win, _, loss = showdown_equity([44, 45, 46])
+    assert mcts.calculate_reward(showdown([44, 45, 46])) == pytest.approx(win - loss)
+
+
+def test_hands_outside_the_table_fall_back_to_the_hand_type():
+    mcts = MCTS(ZhaJinHuaScoreCalculator(), seed=0)
+    with pytest.raises(ValueError):
+        showdown_equity(KINGS_WITH_DUPLICATE_ART)
+    assert mcts.calculate_reward(showdown(KINGS_WITH_DUPLICATE_ART)) == 1.0
+    assert mcts.calculate_reward(showdown(PAIR_WITH_JOKER)) == -1.0
+
+
+@pytest.mark.parametrize('hand', [KINGS_WITH_DUPLICATE_ART, PAIR_WITH_JOKER])
+def test_search_runs_for_hands_outside_the_table(hand):
+    mcts = MCTS(ZhaJinHuaScoreCalculator(), seed=0)
+    state = ZhaJinHuaState(hand, 5, 5, 0, 0, True)
+    assert mcts.get_best_action(state, iterations=200) in state.get_possible_actions()
+    assert mcts.terminal_action(ZhaJinHuaState(hand, 0, 5, 1, 1, True)) == 'fold'
+
+
+def test_range_tracking_skips_hands_outside_the_table():
+    ai = ZhaJinHuaAI(ZhaJinHuaScoreCalculator(), iterations=100, seed=0, track_range=True)
+    ai.get_best_action(ZhaJinHuaState([44, 45, 46], 5, 4, 0, 1, False))
+    assert ai.opponent_range is not None and ai.opponent_range.observed_bet == 1
+    state = ZhaJinHuaState(PAIR_WITH_JOKER, 5, 5, 0, 0, True)
+    assert ai.get_best_action(state) in state.get_possible_actions()
+    assert ai.opponent_range is None and ai.mcts.opponent_range is None
+
+
+def test_suggestions_only_read_the_clock_when_profiling(monkeypatch):
+    state = ZhaJinHuaState([44, 45, 46], 5, 5, 0, 0, True)
+    quiet = ZhaJinHuaAI(ZhaJinHuaScoreCalculator(), iterations=100, seed=0)
+
+    def no_clock():
+        raise AssertionError('clock read without profiling')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(MCTS_agent.time, 'perf_counter', no_clock)
+        assert 'Search:' not in quiet.get_suggestion(state)
+    assert quiet.last_stats is None
+
+    profiled = ZhaJinHuaAI(ZhaJinHuaScoreCalculator(), iterations=100, seed=0, profile=True)
+    assert 'Search:' in profiled.get_suggestion(state)
+    assert profiled.last_stats is not None and profiled.last_stats.iterations == 100
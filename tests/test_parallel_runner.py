@@ -0,0 +1,42 @@
+"""Seeding of the parallel strategy runner: results must not depend on how the work is spread"""
+import numpy as np
+
+from batch_simulator import NUM_HAND_STRENGTHS, uniform_table
+from parallel_runner import plan_chunks, run_matchups
+
+
+def threshold_table(fold_below, bet2_from, max_coins=10):
+    actions = [0 if hand < fold_below else 2 if hand >= bet2_from else 1 for hand in range(NUM_HAND_STRENGTHS)]
+    return np.repeat(np.eye(3)[actions][np.newaxis], max_coins + 1, axis=0)
+
+
+TABLES = {'Conservative': threshold_table(5, 10), 'Aggressive': threshold_table(1, 5), 'Random': uniform_table(10)}
+PAIRS = [('Conservative', 'Aggressive'), ('Random', 'Conservative'), ('Aggressive', 'Random')]
+
+
+def test_chunks_cover_the_games():
+    assert plan_chunks(5000, 2000) == [2000, 2000, 1000]
+    assert plan_chunks(4000, 2000) == [2000, 2000]
+
+
+def test_results_do_not_depend_on_workers():
+    options = dict(master_seed=3, chunk_size=1000, progress=False)
+    serial = run_matchups(PAIRS, TABLES, 5000, workers=1, **options)
+    assert serial == run_matchups(PAIRS, TABLES, 5000, workers=2, **options)
+    assert all(sum(counts) == 5000 for counts in serial)
+
+
+def test_adaptive_results_do_not_depend_on_workers():
+    options = dict(master_seed=3, chunk_size=500, progress=False, target_width=0.05)
+    serial = run_matchups(PAIRS, TABLES, 20000, workers=1, **options)
+    assert serial == run_matchups(PAIRS, TABLES, 20000, workers=2, **options)
+    # Each pair stops on its own once its interval is narrow enough
+    assert all(sum(counts) % 500 == 0 and sum(counts) < 20000 for counts in serial)
+
+
+def test_a_pair_gets_the_same_result_in_any_sweep():
+    options = dict(master_seed=3, chunk_size=1000, progress=False, workers=1)
+    full = run_matchups(PAIRS, TABLES, 3000, **options)
+    assert run_matchups(PAIRS[::-1], TABLES, 3000, **options) == full[::-1]
+    assert run_matchups(PAIRS[1:2], TABLES, 3000, **options) == full[1:2]
+    assert run_matchups(PAIRS, TABLES, 3000, **dict(options, master_seed=4)) != full
@@ -0,0 +1,40 @@
+"""Return values and caching of the two analysis modules"""
+import numpy as np
+import pytest
+
+import zhajinhua_visulization_agent
+from zhajinhua_visulization import MatchupResult, run_strategy_matrix, simulate_multiple_games
+
+
+@pytest.mark.parametrize('options', [{}, {'batched': True}, {'exact': True}])
+def test_simulate_multiple_games_returns_four_values(options):
+    wins, losses, draws, rate = simulate_multiple_games('Conservative', 'Aggressive', 200,
+                                                        rng=np.random.default_rng(0), **options)
+    assert wins + losses + draws == pytest.approx(200)
+    assert rate == pytest.approx(wins / 200 * 100)
+
+
+def test_adaptive_result_carries_the_interval():
+    result = simulate_multiple_games('Conservative', 'Aggressive', 20000, rng=np.random.default_rng(0),
+                                     adaptive=True, target_width=0.05)
+    assert isinstance(result, MatchupResult)
+    assert result.player_wins + result.opponent_wins + result.draws == result.games < 20000
+    assert result.ci_low <= result.win_rate <= result.ci_high
+    assert result.ci_high - result.ci_low <= 5
+
+
+def test_strategy_matrix_only_caches_when_asked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = run_strategy_matrix(200, workers=1)
+    assert len(df) == 64 and (df['Games'] == 200).all()
+    assert list(tmp_path.iterdir()) == []
+    store = tmp_path / 'matrix.jsonl'
+    assert run_strategy_matrix(200, workers=1, store=str(store)).equals(df)
+    assert store.exists()
+
+
+def test_agent_sweep_rejects_a_store_it_cannot_use():
+    with pytest.raises(ValueError):
+        zhajinhua_visulization_agent.run_simulations(100, batched=True, store='cache.jsonl')
+    with pytest.raises(SystemExit):
+        zhajinhua_visulization_agent.main(['--mode', 'batched', '--cache', 'cache.jsonl'])
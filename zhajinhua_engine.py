@@ -0,0 +1,231 @@
+"""
+Headless Zha Jin Hua rules engine.
+
+Holds the betting, fold, showdown and dealer-rotation rules with no Tk
+dependency, so full-card games can be simulated without a window. The GUI in
+zhajinhua_simulator.py is a view over this engine.
+"""
+import random
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from MCTS_agent import ZhaJinHuaAI, ZhaJinHuaState
+from cards import ACTIONS, DECK, DECK_PATH, HAND_ORDINALS, hand_index
+from hand_history import HandHistory
+
+PLAYER = 0
+OPPONENT = 1
+
+
+class ZhaJinHuaSimulator:
+    """Deck and dealer button; deals integer card ids with no file I/O"""
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.Dealer = rng.randint(0, 1)
+        self.deck_path = DECK_PATH
+        self.deck = self.get_deck()
+        self.player_hand = []
+        self.opponent_hand = []
+
+    def get_deck(self):
+        # Cards are integer ids 0..51; see cards.card_image_path for rendering
+        return list(DECK)
+
+    def deal_hands(self, hand_num=3):
+        if len(self.deck) < hand_num * 2:
+            raise ValueError("Not enough cards to deal.")
+        # Partial Fisher-Yates shuffle: only the dealt prefix of the deck is randomised
+        deck = self.deck
+        randrange = self.rng.randrange
+        for i in range(hand_num * 2):
+            j = randrange(i, len(deck))
+            deck[i], deck[j] = deck[j], deck[i]
+        first, second = deck[:hand_num], deck[hand_num:hand_num * 2]
+        if self.Dealer == 0:
+            self.player_hand, self.opponent_hand = first, second
+        else:
+            self.opponent_hand, self.player_hand = first, second
+        return self.player_hand, self.opponent_hand
+
+
+class Event(NamedTuple):
+    """Something that happened during a step, for views and logs"""
+    kind: str                     # 'bet', 'fold' or 'showdown'
+    seat: int                     # Seat that acted; for a showdown, the seat that closed the betting
+    amount: int = 0               # Coins bet
+    pot: int = 0                  # Pot size when the round was resolved
+    winner: Optional[int] = None  # Seat that took the pot, None for a tie
+
+
+class Policy:
+    """Chooses an action for the seat to act, given that seat's view of the game"""
+    def choose_action(self, state: ZhaJinHuaState) -> str:
+        raise NotImplementedError
+
+
+class RandomPolicy(Policy):
+    """Picks fold, bet1 or bet2 uniformly, like the GUI's random opponent"""
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def choose_action(self, state: ZhaJinHuaState) -> str:
+        return self.rng.choice(ACTIONS)
+
+
+class AIPolicy(Policy):
+    """Plays the action suggested by a ZhaJinHuaAI"""
+    def __init__(self, ai: ZhaJinHuaAI):
+        self.ai = ai
+
+    def choose_action(self, state: ZhaJinHuaState) -> str:
+        return self.ai.get_best_action(state)
+
+
+class ZhaJinHuaEngine:
+    """
+    Two-seat game state and rules. The dealer acts first; each seat either folds
+    or bets (raised to at least the amount needed to call). A fold hands the pot
+    to the other seat, and once both seats have bet the hands are compared.
+    The dealer button passes after every round and the game ends when a seat
+    has no coins left at the end of a round.
+    With a HandHistory, every finished round is recorded to it.
+    """
+    def __init__(self, starting_coins: int = 5, simulator: Optional[ZhaJinHuaSimulator] = None,
+                 seed: Optional[int] = None, history: Optional[HandHistory] = None):
+        self.starting_coins = starting_coins
+        self.rng = random.Random(seed)
+        self.simulator = simulator if simulator is not None else ZhaJinHuaSimulator(self.rng)
+        self.history = history
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new game with fresh stacks"""
+        self.coins = [self.starting_coins, self.starting_coins]
+        self.bets = [0, 0]
+        self.hands: List[List[int]] = [[], []]
+        self.to_act = self.dealer
+        self.round_number = 0
+        self.round_over = True
+        self.game_over = False
+        self.record: Optional[Dict] = None  # The round being recorded for history
+
+    @property
+    def dealer(self) -> int:
+        return self.simulator.Dealer
+
+    @property
+    def pot(self) -> int:
+        return self.bets[PLAYER] + self.bets[OPPONENT]
+
+    def start_round(self) -> List[List[int]]:
+        """Deal a new round and return both hands"""
+        if self.game_over:
+            raise RuntimeError("The game is over; call reset() to play again.")
+        player_hand, opponent_hand = self.simulator.deal_hands()
+        self.hands = [player_hand, opponent_hand]
+        self.bets = [0, 0]
+        self.to_act = self.dealer
+        self.round_number += 1
+        self.round_over = False
+        if self.history is not None:
+            self.record = {'round': self.round_number, 'dealer': self.dealer, 'coins': list(self.coins),
+                           'hands': [list(player_hand), list(opponent_hand)], 'actions': []}
+        return self.hands
+
+    def observe(self, seat: int) -> ZhaJinHuaState:
+        """The game as seen by `seat`"""
+        other = 1 - seat
+        return ZhaJinHuaState(self.hands[seat], self.coins[seat], self.coins[other],
+                              self.bets[seat], self.bets[other], self.dealer == seat)
+
+    def step(self, action: str) -> List[Event]:
+        """Apply `action` for the seat to act and return what happened"""
+        if self.round_over:
+            raise RuntimeError("No round in progress; call start_round() first.")
+        seat = self.to_act
+        other = 1 - seat
+        if action == 'fold':
+            return [self._award(Event('fold', seat, pot=self.pot, winner=other), action)]
+        if not action.startswith('bet'):
+            raise ValueError(f"Unknown action {action!r}")
+
+        min_bet = max(self.bets[other] - self.bets[seat], 1)
+        bet_amount = max(int(action[3:]), min_bet)
+        if bet_amount > self.coins[seat]:
+            # Can't cover the bet: treated as a fold
+            return [self._award(Event('fold', seat, pot=self.pot, winner=other), action)]
+
+        self.bets[seat] += bet_amount
+        self.coins[seat] -= bet_amount
+        if self.record is not None:
+            self.record['actions'].append([seat, action, bet_amount])
+        events = [Event('bet', seat, bet_amount)]
+        if self.bets[seat] > 0 and self.bets[other] > 0:
+            events.append(self._showdown(seat))
+        else:
+            self.to_act = other
+        return events
+
+    def _showdown(self, seat: int) -> Event:
+        player_ordinal = HAND_ORDINALS[hand_index(*self.hands[PLAYER])]
+        opponent_ordinal = HAND_ORDINALS[hand_index(*self.hands[OPPONENT])]
+        if player_ordinal > opponent_ordinal:
+            winner = PLAYER
+        elif opponent_ordinal > player_ordinal:
+            winner = OPPONENT
+        else:
+            winner = None
+        return self._award(Event('showdown', seat, pot=self.pot, winner=winner))
+
+    def _award(self, event: Event, action: Optional[str] = None) -> Event:
+        """Pay out the pot, pass the dealer button and close the round"""
+        if self.record is not None:
+            if event.kind == 'fold':
+                # Recorded as asked for with 0 coins: a bet the seat couldn't cover also ends the round here
+                self.record['actions'].append([event.seat, action, 0])
+            self.record['result'] = {'kind': event.kind, 'winner': event.winner, 'pot': event.pot}
+        if event.winner is None:
+            # True tie - bets are returned
+            self.coins[PLAYER] += self.bets[PLAYER]
+            self.coins[OPPONENT] += self.bets[OPPONENT]
+        else:
+            self.coins[event.winner] += self.pot
+        self.bets = [0, 0]
+        self.simulator.Dealer = 1 - self.simulator.Dealer
+        self.round_over = True
+        self.game_over = self.coins[PLAYER] <= 0 or self.coins[OPPONENT] <= 0
+        if self.record is not None:
+            self.record['final_coins'] = list(self.coins)
+            self.history.write(self.record)
+            self.record = None
+        return event
+
+    def play_round(self, policies: Sequence[Policy]) -> List[Event]:
+        """Deal and play one round with `policies[seat]` choosing each seat's actions"""
+        self.start_round()
+        events = []
+        while not self.round_over:
+            seat = self.to_act
+            events.extend(self.step(policies[seat].choose_action(self.observe(seat))))
+        return events
+
+    def play_game(self, policies: Sequence[Policy], max_rounds: Optional[int] = 1000) -> Optional[int]:
+        """
+        Play a full game from fresh stacks; returns the winning seat, or None if
+        max_rounds ran out. There is no ante, so two seats that keep folding
+        before betting never finish without a round cap.
+        """
+        self.reset()
+        while not self.game_over and (max_rounds is None or self.round_number < max_rounds):
+            self.play_round(policies)
+        if not self.game_over:
+            return None
+        return PLAYER if self.coins[PLAYER] > 0 else OPPONENT
+
+    def play_games(self, policies: Sequence[Policy], num_games: int,
+                   max_rounds: Optional[int] = 1000) -> Dict[str, int]:
+        """Play `num_games` games and tally Player / Opponent / Draw results"""
+        results = {'Player': 0, 'Opponent': 0, 'Draw': 0}
+        names = {PLAYER: 'Player', OPPONENT: 'Opponent', None: 'Draw'}
+        for _ in range(num_games):
+            results[names[self.play_game(policies, max_rounds)]] += 1
+        return results
@@ -1,146 +1,102 @@
 import os
-import random
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
 from PIL import Image, ImageTk
 from MCTS_agent import ZhaJinHuaScoreCalculator, ZhaJinHuaState, ZhaJinHuaAI
+from cards import DECK, card_image_path
+from hand_history import DEFAULT_PATH as HAND_HISTORY_PATH, HandHistory
+from zhajinhua_engine import OPPONENT, PLAYER, RandomPolicy, ZhaJinHuaEngine, ZhaJinHuaSimulator
 
 class PlayerAction:
     def __init__(self, gui, strategy="human"):
         self.gui = gui
         self.strategy = strategy
+        self.policy = RandomPolicy()
 
     def act(self):
         if self.strategy == "random":
             # Random strategy: randomly choose bet1, bet2, or fold
-            action = random.choice(["bet1", "bet2", "fold"])
-            if action == "fold":
-                self.fold()
-            else:
-                self.bet(int(action[3]))
+            self.gui.apply_action(self.policy.choose_action(self.gui.engine.observe(PLAYER)))
 
     def fold(self):
-        self.gui.log_action("You folded.")
-        self.gui.result_label.config(text="You folded. Opponent takes the pot.", fg="red")
-        total_pot = self.gui.player_bet + self.gui.opponent_bet
-        self.gui.opponent_coins += total_pot
-        self.gui.player_bet = 0
-        self.gui.opponent_bet = 0
-        self.gui.update_coins()
-        self.gui.check_game_over()
-        
-        self.gui.simulator.Dealer = 1 - self.gui.simulator.Dealer
-        self.gui.log_action(f"Dealer switched to {'Opponent' if self.gui.simulator.Dealer == 1 else 'You'}.")
-
-        self.gui.reset_game_with_delay()
-        self.gui.disable_player_actions()
+        self.gui.apply_action("fold")
 
     def bet(self, amount=None):
         if self.strategy == "human":
             if amount is None:
                 self.gui.result_label.config(text="Invalid bet amount.", fg="red")
                 return
-            bet_amount = amount
-            # Get AI suggestion for human player
-            current_state = ZhaJinHuaState(
-                player_hand=self.gui.player_hand,
-                player_coins=self.gui.player_coins,
-                opponent_coins=self.gui.opponent_coins,
-                player_bet=self.gui.player_bet,
-                opponent_bet=self.gui.opponent_bet,
-                is_dealer=self.gui.simulator.Dealer == 0
-            )
             self.gui.update_ai_suggestions()  # Update AI suggestions
-        else:
-            # Random strategy
-            bet_amount = amount
-            
-        # Check if bet is valid
-        if bet_amount < self.gui.current_bet:
-            self.gui.result_label.config(text="You cannot bet less than the current bet.", fg="red")
-            self.gui.log_action("Attempted to bet less than the current bet.")
-            return
 
-        # Process the bet
-        min_bet = max(self.gui.opponent_bet - self.gui.player_bet, 1)
-        bet_amount = max(bet_amount, min_bet)
-        if bet_amount > self.gui.player_coins:
-            self.fold()
-            return
+            # Check if bet is valid
+            if amount < self.gui.current_bet:
+                self.gui.result_label.config(text="You cannot bet less than the current bet.", fg="red")
+                self.gui.log_action("Attempted to bet less than the current bet.")
+                return
 
-        self.gui.player_bet += bet_amount
-        self.gui.player_coins -= bet_amount
-        self.gui.current_bet = max(self.gui.player_bet, self.gui.opponent_bet)
-        self.gui.update_coins()
-        self.gui.update_current_bet_label()
-        self.gui.result_label.config(text=f"You bet {bet_amount}.", fg="green")
-        self.gui.log_action(f"You bet {bet_amount} coins.")
-        self.gui.check_game_over()
-
-        if self.gui.player_bet > 0 and self.gui.opponent_bet > 0:
-            if self.gui.simulator.Dealer != 0:
-                self.gui.showdown()
-        else:
-            if self.gui.simulator.Dealer == 0:
-                self.gui.root.after(500, self.gui.opponent_handler.act)
+        self.gui.apply_action(f"bet{amount}")
 
 class OpponentAction:
     def __init__(self, gui):
         self.gui = gui
+        self.policy = RandomPolicy()
 
     def act(self):
         self.bet()
 
     def fold(self):
-        self.gui.log_action("Opponent folded.")
-        self.gui.result_label.config(text="Opponent folded. You take the pot.", fg="green")
-        total_pot = self.gui.player_bet + self.gui.opponent_bet
-        self.gui.player_coins += total_pot
-        self.gui.player_bet = 0
-        self.gui.opponent_bet = 0
-        self.gui.update_coins()
-        self.gui.check_game_over()
-        
-        self.gui.simulator.Dealer = 1 - self.gui.simulator.Dealer
-        self.gui.log_action(f"Dealer switched to {'You' if self.gui.simulator.Dealer == 0 else 'Opponent'}.")
-
-        self.gui.reset_game_with_delay()
-        self.gui.disable_player_actions()
+        self.gui.apply_action("fold")
 
     def bet(self):
         # Random strategy for opponent
-        action = random.choice(["bet1", "bet2", "fold"])
-        
-        if action == "fold":
-            self.fold()
-            return
-            
-        bet_amount = 1 if action == "bet1" else 2
-        min_bet = max(self.gui.player_bet - self.gui.opponent_bet, 1)
-        bet_amount = max(bet_amount, min_bet)
-        
-        if bet_amount > self.gui.opponent_coins:
-            self.fold()
-            return
-            
-        self.gui.opponent_bet += bet_amount
-        self.gui.opponent_coins -= bet_amount
-        self.gui.current_bet = max(self.gui.player_bet, self.gui.opponent_bet)
-        self.gui.update_coins()
-        self.gui.update_current_bet_label()
-        self.gui.result_label.config(text=f"Opponent bets {bet_amount}.", fg="blue")
-        self.gui.log_action(f"Opponent bets {bet_amount} coins.")
-        self.gui.check_game_over()
-        
-        if self.gui.player_bet > 0 and self.gui.opponent_bet > 0:
-            self.gui.showdown()
-        elif self.gui.player_bet == 0 and self.gui.opponent_bet == 0:
-            self.gui.showdown()
-        else:
-            if self.gui.player_handler.strategy == "random":
-                self.gui.root.after(500, self.gui.player_handler.act)
-            else:
-                self.gui.enable_player_actions()
+        self.gui.apply_action(self.policy.choose_action(self.gui.engine.observe(OPPONENT)))
+
+CARD_BACK_PATH = "./card_back.jpg"
+CARD_SIZE = (80, 120)
+LOG_MAX_LINES = 500   # Lines kept in the on-screen game log
+LOG_TRIM_LINES = 100  # Extra lines dropped per trim, so trimming is not done on every message
+
+class CardImageCache:
+    """
+    Decodes and resizes each card image once and hands out the same PhotoImage
+    for it on every deal. Missing images get a gray placeholder.
+    preload() decodes in a background thread; PhotoImages are still only
+    created on the Tk thread, where they are cheap once the pixels are ready.
+    """
+    def __init__(self, size=CARD_SIZE):
+        self.size = size
+        self.decoded = {}  # path -> resized PIL image, filled by preload()
+        self.images = {}   # path -> PhotoImage
+
+    def get(self, card):
+        path = card_image_path(card)
+        image = self.images.get(path)
+        if image is None:
+            source = self.decoded.get(path)
+            if source is None:
+                source = self.decode(path)
+            image = self.images[path] = ImageTk.PhotoImage(source)
+        return image
+
+    def decode(self, path):
+        if not os.path.exists(path):
+            # 如果卡片图片不存在，使用占位图
+            return Image.new('RGB', self.size, color='gray')
+        with Image.open(path) as source:
+            return source.resize(self.size)
+
+    def preload(self, cards):
+        paths = [card_image_path(card) for card in cards]
+
+        def run():
+            for path in paths:
+                if path not in self.decoded:
+                    self.decoded[path] = self.decode(path)
+
+        threading.Thread(target=run, daemon=True).start()
+
 class SimulationStart:
     def __init__(self, gui):
         self.gui = gui
@@ -151,16 +107,14 @@ class SimulationStart:
         self.gui.log_action(f"Round {self.gui.round_number}")    
         self.gui.round_number += 1  
 
-        self.gui.player_hand, self.gui.opponent_hand = self.gui.simulator.deal_hands()
+        self.gui.engine.start_round()
+        self.gui.suggestion_worker.cancel()
+        self.gui.ai_advisor.new_round()
         self.gui.display_hand(self.gui.player_frame, self.gui.player_hand)
-        card_back_path = "./card_back.jpg"
-        self.gui.display_hand(self.gui.opponent_frame, [card_back_path] * len(self.gui.opponent_hand))
+        self.gui.display_hand(self.gui.opponent_frame, [CARD_BACK_PATH] * len(self.gui.opponent_hand))
         dealer_text = "You are the dealer." if self.gui.simulator.Dealer == 0 else "Opponent is the dealer."
         self.gui.dealer_label.config(text=dealer_text)
         self.gui.result_label.config(text="Game started! Make your move.", fg="green")
-        self.gui.player_bet = 0
-        self.gui.opponent_bet = 0
-        self.gui.current_bet = 0
         self.gui.update_current_bet_label()
         self.gui.update_ai_suggestions()
 
@@ -180,41 +134,59 @@ class SimulationStart:
         # **移除庄家标志切换**
         # self.gui.simulator.Dealer = 1 - self.gui.simulator.Dealer
 
-class ZhaJinHuaSimulator:
-    def __init__(self):
-        self.Dealer = random.randint(0, 1)
-        self.deck_path = "./PNG-cards-1.3/"
-        self.deck = self.get_deck()
-        self.player_hand = []
-        self.opponent_hand = []
-
-    def get_deck(self):
-        if os.path.exists(self.deck_path) and os.path.isdir(self.deck_path):
-            deck = os.listdir(self.deck_path)
-            deck = [os.path.join(self.deck_path, card) for card in deck if card.endswith(".png")]
-            return deck
-        return []
-
-    def deal_hands(self, hand_num=3):
-        self.deck = self.get_deck()
-        if len(self.deck) < hand_num * 2:
-            messagebox.showerror("Error", "Not enough cards to deal.")
-            return [], []
-        if self.Dealer == 0:
-            self.player_hand = random.sample(self.deck, hand_num)
-            for card in self.player_hand:
-                self.deck.remove(card)
-            self.opponent_hand = random.sample(self.deck, hand_num)
-            for card in self.opponent_hand:
-                self.deck.remove(card)
-        else:
-            self.opponent_hand = random.sample(self.deck, hand_num)
-            for card in self.opponent_hand:
-                self.deck.remove(card)
-            self.player_hand = random.sample(self.deck, hand_num)
-            for card in self.player_hand:
-                self.deck.remove(card)
-        return self.player_hand, self.opponent_hand
+class SuggestionWorker:
+    """
+    Runs AI suggestions on a background thread so the Tk main loop never blocks.
+    Results come back through root.after polling; only the newest request is
+    delivered, anything older is dropped as stale.
+    """
+    POLL_MS = 50
+
+    def __init__(self, root, ai_advisor, on_result):
+        self.root = root
+        self.ai_advisor = ai_advisor
+        self.on_result = on_result
+        self.generation = 0
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def submit(self, state):
+        """Request a suggestion for `state`, superseding any earlier request"""
+        self.cancel()
+        self.requests.put((self.generation, state))
+
+    def cancel(self):
+        """Drop pending requests and ignore results of searches already running"""
+        self.generation += 1
+        while True:
+            try:
+                self.requests.get_nowait()
+            except queue.Empty:
+                break
+
+    def _run(self):
+        while True:
+            generation, state = self.requests.get()
+            if generation != self.generation:
+                continue
+            try:
+                message = self.ai_advisor.get_suggestion(state)
+            except Exception as e:
+                message = f"AI suggestion failed: {e}"
+            self.results.put((generation, message))
+
+    def _poll(self):
+        while True:
+            try:
+                generation, message = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation:
+                self.on_result(message)
+        self.root.after(self.POLL_MS, self._poll)
 
 class ZhaJinHuaGUI:
     def __init__(self, root, simulator, player_strategy="human"):
@@ -223,25 +195,28 @@ class ZhaJinHuaGUI:
         self.simulator = simulator
         self.root.geometry("1200x700")
         self.root.title("Zha Jin Hua Game")
-        self.player_coins = 5
-        self.opponent_coins = 5
-        self.current_bet = 0
-        self.player_bet = 0
-        self.opponent_bet = 0
-        self.player_hand = []
-        self.opponent_hand = []
+        # All game rules and state live in the headless engine; this class only renders it
+        self.hand_history = HandHistory(HAND_HISTORY_PATH)
+        self.engine = ZhaJinHuaEngine(starting_coins=5, simulator=simulator, history=self.hand_history)
+        self.log_lines = 0
         self.player_strategy = player_strategy
 
         # Initialize AI advisor
         self.score_calculator = ZhaJinHuaScoreCalculator()
-        self.ai_advisor = ZhaJinHuaAI(self.score_calculator)
+        # track_range: the advisor narrows the opponent's likely hands from their bets.
+        # The precomputed policy table can't use that range, so it is not loaded here.
+        self.ai_advisor = ZhaJinHuaAI(self.score_calculator, track_range=True)
+        self.suggestion_worker = SuggestionWorker(self.root, self.ai_advisor, self.show_ai_message)
 
         # 初始化处理器
         self.player_handler = PlayerAction(self, strategy=player_strategy)
         self.opponent_handler = OpponentAction(self)
         self.simulation_handler = SimulationStart(self)
 
+        self.card_images = CardImageCache()
         self.setup_ui()
+        # Decode the whole deck up front, so no deal pays for it
+        self.card_images.preload([*DECK, CARD_BACK_PATH])
 
         # 根据策略禁用或启用按钮
         if self.player_strategy == "human":
@@ -251,6 +226,34 @@ class ZhaJinHuaGUI:
 
         self.start_game()
 
+    @property
+    def player_coins(self):
+        return self.engine.coins[PLAYER]
+
+    @property
+    def opponent_coins(self):
+        return self.engine.coins[OPPONENT]
+
+    @property
+    def player_bet(self):
+        return self.engine.bets[PLAYER]
+
+    @property
+    def opponent_bet(self):
+        return self.engine.bets[OPPONENT]
+
+    @property
+    def current_bet(self):
+        return max(self.player_bet, self.opponent_bet)
+
+    @property
+    def player_hand(self):
+        return self.engine.hands[PLAYER]
+
+    @property
+    def opponent_hand(self):
+        return self.engine.hands[OPPONENT]
+
     def setup_ui(self):
         # 配置根网格
         self.root.columnconfigure(0, weight=1)
@@ -334,25 +337,35 @@ class ZhaJinHuaGUI:
         # 动作由SimulationStart.start_new_round()根据庄家决定
 
     def display_hand(self, frame, hand):
-        for widget in frame.winfo_children():
-            widget.destroy()
-        for card_path in hand:
-            if os.path.exists(card_path):
-                img = Image.open(card_path).resize((80, 120))
-            else:
-                # 如果卡片图片不存在，使用占位图
-                img = Image.new('RGB', (80, 120), color='gray')
-            card_img = ImageTk.PhotoImage(img)
-            card_label = tk.Label(frame, image=card_img)
-            card_label.image = card_img
-            card_label.pack(side="left", padx=5)
+        # Card labels are kept between deals and only have their cached image swapped
+        labels = frame.winfo_children()
+        if len(labels) != len(hand):
+            for widget in labels:
+                widget.destroy()
+            labels = [tk.Label(frame) for _ in hand]
+            for card_label in labels:
+                card_label.pack(side="left", padx=5)
+        for card_label, card in zip(labels, hand):
+            card_label.config(image=self.card_images.get(card))
 
     def log_action(self, message):
+        # The on-screen log is a ring buffer: past LOG_MAX_LINES the oldest LOG_TRIM_LINES
+        # are dropped in one delete, so long sessions keep the Text widget small
         self.log_text.config(state="normal")
         self.log_text.insert(tk.END, message + "\n")
+        self.log_lines += message.count("\n") + 1
+        if self.log_lines > LOG_MAX_LINES:
+            excess = self.log_lines - LOG_MAX_LINES + LOG_TRIM_LINES
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_lines -= excess
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
 
+    def close(self):
+        """Write out the buffered hand history and stop the AI's worker pool"""
+        self.hand_history.close()
+        self.ai_advisor.close()
+
     def calculate_score(self, hand):
         """
         Calculate score for Zha Jin Hua (Chinese Poker) hands
@@ -364,71 +377,7 @@ class ZhaJinHuaGUI:
         3 - Pair (对子)
         2 - High Card (单张)
         """
-        # Parse cards from filenames like "2_of_hearts.png"
-        cards = []
-        for card in hand:
-            filename = os.path.basename(card)
-            # Split the filename to get rank and suit
-            # Example: "2_of_hearts.png" -> ["2", "of", "hearts.png"]
-            parts = filename.split('_')
-            rank = parts[0]
-            suit = parts[2].split('.')[0]  # Remove ".png" extension
-            
-            # Convert rank to numeric value
-            rank_value = {
-                'ace': 14, 'king': 13, 'queen': 12, 'jack': 11,
-                '10': 10, '9': 9, '8': 8, '7': 7,
-                '6': 6, '5': 5, '4': 4, '3': 3, '2': 2
-            }.get(rank.lower(), int(rank) if rank.isdigit() else 0)
-            
-            cards.append((rank_value, suit))
-        
-        # Sort cards by value for easier comparison
-        cards.sort(reverse=True)
-        values = [card[0] for card in cards]
-        suits = [card[1] for card in cards]
-        
-        # Check for Three of a Kind (豹子)
-        if len(set(values)) == 1:
-            return 7, max(values)
-        
-        # Check for Flush (同花)
-        is_flush = len(set(suits)) == 1
-        
-        # Check for Straight (顺子)
-        is_straight = False
-        straight_value = 0
-        
-        # Special case: Ace-2-3 straight
-        if set(values) == {14, 2, 3}:
-            is_straight = True
-            straight_value = 3  # In A-2-3 straight, 3 is the highest card
-        # Normal straight
-        elif max(values) - min(values) == 2 and len(set(values)) == 3:
-            is_straight = True
-            straight_value = max(values)
-        
-        # Straight Flush (同花顺)
-        if is_straight and is_flush:
-            return 6, straight_value or max(values)
-        
-        # Flush (同花)
-        if is_flush:
-            return 5, max(values)
-        
-        # Straight (顺子)
-        if is_straight:
-            return 4, straight_value or max(values)
-        
-        # Pair (对子)
-        if len(set(values)) == 2:
-            # Find the pair value
-            for value in values:
-                if values.count(value) == 2:
-                    return 3, value
-        
-        # High Card (单张)
-        return 2, max(values)
+        return self.score_calculator.calculate_score(hand)
 
     def update_coins(self):
         self.player_coins_label.config(text=f"Your Coins: {self.player_coins}")
@@ -438,6 +387,55 @@ class ZhaJinHuaGUI:
         total_bet = self.player_bet + self.opponent_bet
         self.current_bet_label.config(text=f"Current Bet: {total_bet}")
 
+    def apply_action(self, action):
+        """Play `action` for the seat to act and render the resulting events"""
+        for event in self.engine.step(action):
+            if event.kind == "bet":
+                self.show_bet(event)
+            elif event.kind == "fold":
+                self.show_fold(event)
+            else:
+                self.showdown(event)
+
+        if self.engine.round_over:
+            return
+        if self.engine.to_act == PLAYER:
+            # The opponent just bet; refresh the suggestion so the advisor sees it
+            self.update_ai_suggestions()
+        if self.engine.to_act == OPPONENT:
+            self.disable_player_actions()
+            self.root.after(500, self.opponent_handler.act)
+        elif self.player_handler.strategy == "random":
+            self.root.after(500, self.player_handler.act)
+        else:
+            self.enable_player_actions()
+
+    def show_bet(self, event):
+        self.update_coins()
+        self.update_current_bet_label()
+        if event.seat == PLAYER:
+            self.result_label.config(text=f"You bet {event.amount}.", fg="green")
+            self.log_action(f"You bet {event.amount} coins.")
+        else:
+            self.result_label.config(text=f"Opponent bets {event.amount}.", fg="blue")
+            self.log_action(f"Opponent bets {event.amount} coins.")
+
+    def show_fold(self, event):
+        if event.seat == PLAYER:
+            self.log_action("You folded.")
+            self.result_label.config(text="You folded. Opponent takes the pot.", fg="red")
+        else:
+            self.log_action("Opponent folded.")
+            self.result_label.config(text="Opponent folded. You take the pot.", fg="green")
+        self.update_coins()
+        self.update_current_bet_label()
+        self.check_game_over()
+
+        self.log_action(f"Dealer switched to {'Opponent' if self.engine.dealer == OPPONENT else 'You'}.")
+
+        self.reset_game_with_delay()
+        self.disable_player_actions()
+
     def reset_game_with_delay(self):
         self.root.after(2000, self.simulation_handler.start_new_round)
 
@@ -463,20 +461,11 @@ class ZhaJinHuaGUI:
         self.fold_button.config(state="disabled")
         # self.check_button.config(state="disabled")  # 已移除 Check 按钮
 
-    def showdown(self):
+    def showdown(self, event):
         # Disable player actions as the round is ending
         self.disable_player_actions()
 
-        if self.player_bet == 0 and self.opponent_bet == 0:
-            self.result_label.config(text="Both players checked. It's a draw!", fg="orange")
-            self.log_action("Both players checked. Bets are returned.")
-            self.update_ai_suggestions("It's a draw! Consider your next move.")
-            self.simulator.Dealer = 1 - self.simulator.Dealer
-            self.log_action(f"Dealer switched to {'Opponent' if self.simulator.Dealer == 1 else 'You'}.")
-            self.reset_game_with_delay()
-            return
-
-        total_pot = self.player_bet + self.opponent_bet
+        total_pot = event.pot
         self.log_action(f"Total pot is {total_pot} coins.")
         self.display_hand(self.opponent_frame, self.opponent_hand)  # Show opponent's cards
         
@@ -495,53 +484,47 @@ class ZhaJinHuaGUI:
         self.log_action(f"Your hand: {hand_types[player_result[0]]} (High card: {player_result[1]})")
         self.log_action(f"Opponent's hand: {hand_types[opponent_result[0]]} (High card: {opponent_result[1]})")
 
-        # Compare hands - first by type, then by value if types are equal
-        if player_result[0] > opponent_result[0] or \
-        (player_result[0] == opponent_result[0] and player_result[1] > opponent_result[1]):
-            self.player_coins += total_pot
+        # The engine has already compared hands by strength ordinal and paid the pot
+        if event.winner == PLAYER:
             self.result_label.config(text=f"You win! 🎉 You take {total_pot} coins.", fg="green")
             self.log_action(f"You won {total_pot} coins in the showdown.")
             self.update_ai_suggestions("Great job! You have a stronger hand.")
-        elif player_result[0] < opponent_result[0] or \
-            (player_result[0] == opponent_result[0] and player_result[1] < opponent_result[1]):
-            self.opponent_coins += total_pot
+        elif event.winner == OPPONENT:
             self.result_label.config(text=f"You lose! 😢 Opponent takes {total_pot} coins.", fg="red")
             self.log_action(f"Opponent won {total_pot} coins in the showdown.")
             self.update_ai_suggestions("Opponent has a stronger hand. Try to improve your strategy.")
         else:
-            # True tie - split the pot
-            self.player_coins += self.player_bet
-            self.opponent_coins += self.opponent_bet
+            # True tie - bets were returned
             self.result_label.config(text="It's a draw! 🤝", fg="orange")
             self.log_action("It's a draw! Bets are returned.")
             self.update_ai_suggestions("It's a draw. Both players retain their bets.")
 
-        # Reset bets
-        self.player_bet = 0
-        self.opponent_bet = 0
-
-        # Switch dealer
-        self.simulator.Dealer = 1 - self.simulator.Dealer
-        self.log_action(f"Dealer switched to {'Opponent' if self.simulator.Dealer == 1 else 'You'}.")
+        self.log_action(f"Dealer switched to {'Opponent' if self.engine.dealer == OPPONENT else 'You'}.")
 
         self.update_coins()
+        self.update_current_bet_label()
         self.check_game_over()
         self.reset_game_with_delay()
         
     def update_ai_suggestions(self, suggestion=None):
         if suggestion:
-            ai_message = suggestion
-        else:
-            current_state = ZhaJinHuaState(
-                player_hand=self.player_hand,
-                player_coins=self.player_coins,
-                opponent_coins=self.opponent_coins,
-                player_bet=self.player_bet,
-                opponent_bet=self.opponent_bet,
-                is_dealer=self.simulator.Dealer == 0
-            )
-            ai_message = self.ai_advisor.get_suggestion(current_state)
-            
+            self.suggestion_worker.cancel()
+            self.show_ai_message(suggestion)
+            return
+
+        # States are immutable, so the snapshot can be handed to the worker thread as is
+        current_state = ZhaJinHuaState(
+            player_hand=self.player_hand,
+            player_coins=self.player_coins,
+            opponent_coins=self.opponent_coins,
+            player_bet=self.player_bet,
+            opponent_bet=self.opponent_bet,
+            is_dealer=self.simulator.Dealer == 0
+        )
+        self.show_ai_message("Thinking...")
+        self.suggestion_worker.submit(current_state)
+
+    def show_ai_message(self, ai_message):
         self.ai_text.config(state="normal")
         self.ai_text.delete(1.0, tk.END)
         self.ai_text.insert(tk.END, ai_message)
@@ -553,3 +536,4 @@ if __name__ == "__main__":
     player_strategy = "human"  # Change to "human" for manual play
     app = ZhaJinHuaGUI(root, simulator, player_strategy=player_strategy)
     root.mainloop()
+    app.close()
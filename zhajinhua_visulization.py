@@ -1,116 +1,14 @@
 import random
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 from itertools import product
-from tqdm import tqdm  # For progress bars
+from typing import NamedTuple
+from batch_simulator import MATRIX_RULES, simulate_games_adaptive, simulate_games_batch, wilson_interval
+from markov_solver import solve_matchup
+from parallel_runner import iter_matchups
+from result_store import cached_matchups
+from strategies import MATRIX_STRATEGIES, STRATEGIES, probability_table
 
-# Define strategies
-def conservative_strategy(hand_strength, player_coins):
-    """
-    Conservative Strategy:
-    - Fold if hand strength is below 5.
-    - Bet 1 coin if hand_strength between 5 and 9.
-    - Bet 2 coins if hand_strength is 10.
-    """
-    if hand_strength < 5:
-        return 'fold'
-    elif 5 <= hand_strength <= 9:
-        return 'bet1'
-    else:
-        return 'bet2'
-
-def aggressive_strategy(hand_strength, player_coins):
-    """
-    Aggressive Strategy:
-    - Fold if hand strength is 0.
-    - Bet 1 coin if hand_strength between 1 and 4.
-    - Bet 2 coins if hand_strength is 5 or above.
-    """
-    if hand_strength < 1:
-        return 'fold'
-    elif 1 <= hand_strength < 5:
-        return 'bet1'
-    else:
-        return 'bet2'
-
-def moderate_strategy(hand_strength, player_coins):
-    """
-    Moderate Strategy:
-    - Fold if hand strength is below 4.
-    - Bet 1 coin if hand_strength between 4 and 7.
-    - Bet 2 coins if hand_strength is 8 or above.
-    """
-    if hand_strength < 4:
-        return 'fold'
-    elif 4 <= hand_strength <= 7:
-        return 'bet1'
-    else:
-        return 'bet2'
-
-def random_strategy(hand_strength, player_coins):
-    """
-    Random Strategy:
-    - Randomly choose to fold, bet 1, or bet 2 coins.
-    """
-    return random.choice(['fold', 'bet1', 'bet2'])
-
-# Composite Strategies
-def aggressive_moderate_strategy(hand_strength, player_coins):
-    """
-    Aggressive-Moderate Strategy:
-    - Aggressive when player_coins >= 6.
-    - Moderate otherwise.
-    """
-    if player_coins >= 5:
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return moderate_strategy(hand_strength, player_coins)
-
-def aggressive_conservative_strategy(hand_strength, player_coins):
-    """
-    Aggressive-Conservative Strategy:
-    - Aggressive when player_coins >= 6.
-    - Conservative otherwise.
-    """
-    if player_coins >= 5:
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return conservative_strategy(hand_strength, player_coins)
-
-def conservative_aggressive_strategy(hand_strength, player_coins):
-    """
-    Conservative-Aggressive Strategy:
-    - Conservative when player_coins <= 6.
-    - Aggressive otherwise.
-    """
-    if player_coins <= 5:
-        return conservative_strategy(hand_strength, player_coins)
-    else:
-        return aggressive_strategy(hand_strength, player_coins)
-
-def moderate_aggressive_strategy(hand_strength, player_coins):
-    """
-    Moderate-Aggressive Strategy:
-    - Moderate when player_coins <= 6.
-    - Aggressive otherwise.
-    """
-    if player_coins <= 5:
-        return moderate_strategy(hand_strength, player_coins)
-    else:
-        return aggressive_strategy(hand_strength, player_coins)
-
-# Mapping strategy names to functions
-strategy_functions = {
-    'Conservative': conservative_strategy,
-    'Aggressive': aggressive_strategy,
-    'Moderate': moderate_strategy,
-    'Random': random_strategy,
-    'Aggressive-Moderate': aggressive_moderate_strategy,
-    'Aggressive-Conservative': aggressive_conservative_strategy,
-    'Conservative-Aggressive': conservative_aggressive_strategy,
-    'Moderate-Aggressive': moderate_aggressive_strategy
-}
+# Mapping strategy names to functions (see strategies.py)
+strategy_functions = {name: STRATEGIES[name] for name in MATRIX_STRATEGIES}
 
 def simulate_round(player_strategy, opponent_strategy, player_coins, opponent_coins):
     """
@@ -198,99 +96,201 @@ def simulate_game(player_strategy, opponent_strategy, starting_coins=5, max_roun
     else:
         return 'Draw'
 
-def simulate_multiple_games(player_strategy, opponent_strategy, num_simulations=10000):
+class MatchupResult(NamedTuple):
+    """Sampled tally of one strategy pair, with the 95% Wilson interval of its win rate"""
+    player_wins: int
+    opponent_wins: int
+    draws: int
+    win_rate: float  # Player win rate (%)
+    games: int       # Games played; below the budget when an adaptive pair stopped early
+    ci_low: float    # Interval bounds (%)
+    ci_high: float
+
+def matchup_result(player_wins, opponent_wins, draws):
+    """MatchupResult of a sampled tally, with its win rate and Wilson interval"""
+    games = int(player_wins + opponent_wins + draws)
+    low, high = wilson_interval(int(player_wins), games)
+    return MatchupResult(player_wins, opponent_wins, draws, player_wins / games * 100, games, low * 100, high * 100)
+
+def simulate_multiple_games(player_strategy, opponent_strategy, num_simulations=10000, batched=False, rng=None,
+                            exact=False, adaptive=False, target_width=0.02):
     """
     Simulate multiple games and calculate the player's win rate.
+    With batched=True all games advance in lockstep as NumPy arrays (see batch_simulator),
+    which gives the same outcome distribution orders of magnitude faster.
+    With exact=True nothing is sampled: the counts are the expected values over
+    num_simulations games from the exact Markov-chain solution (see markov_solver).
+    With adaptive=True batched games are played in chunks until the 95% Wilson interval
+    of the win rate is at most target_width wide; num_simulations is then the budget cap.
     
     Returns the number of Player wins, Opponent wins, Draws, and Player win rate (%).
+    With adaptive=True it returns a MatchupResult instead, which adds the games played
+    and the 95% Wilson interval of the win rate (%).
     """
     results = {'Player': 0, 'Opponent': 0, 'Draw': 0}
-    for _ in range(num_simulations):
-        outcome = simulate_game(player_strategy, opponent_strategy)
-        results[outcome] += 1
+    if adaptive:
+        (player_wins, opponent_wins, draws), _ = simulate_games_adaptive(
+            probability_table(player_strategy), probability_table(opponent_strategy), MATRIX_RULES,
+            target_width, max_games=num_simulations, rng=rng
+        )
+        return matchup_result(player_wins, opponent_wins, draws)
+    if exact:
+        probabilities = solve_matchup(probability_table(player_strategy), probability_table(opponent_strategy), MATRIX_RULES)
+        results['Player'], results['Opponent'], results['Draw'] = (p * num_simulations for p in probabilities)
+    elif batched:
+        results['Player'], results['Opponent'], results['Draw'] = simulate_games_batch(
+            probability_table(player_strategy), probability_table(opponent_strategy),
+            num_simulations, MATRIX_RULES, rng=rng
+        )
+    else:
+        for _ in range(num_simulations):
+            outcome = simulate_game(player_strategy, opponent_strategy)
+            results[outcome] += 1
     
     # Calculate win rate: Player wins / Total simulations * 100
     win_rate = (results['Player']) / num_simulations * 100
     return results['Player'], results['Opponent'], results['Draw'], win_rate
 
-# Generate all strategy combinations
-strategies = list(strategy_functions.keys())
-strategy_combinations = list(product(strategies, strategies))  # 8x8=64 combinations
+def run_strategy_matrix(num_simulations_per_pair=10000, master_seed=2024, workers=None,
+                        store=None, adaptive=False, target_width=0.02):
+    """
+    Simulate every (player, opponent) strategy pair and return the results as a DataFrame.
+    Pairs are sharded across a process pool; each chunk of games has its own seed derived
+    from master_seed, so the table is identical for any number of workers.
+    With a `store` file, finished pairs are cached there, so an interrupted or extended sweep resumes.
+    With adaptive=True each pair stops once the 95% Wilson interval of its win rate is at
+    most target_width wide, and num_simulations_per_pair is only the cap.
+    Every row carries the games played and the interval bounds.
+    """
+    import pandas as pd
 
-# Simulate games for each combination
-simulation_results = []
-num_simulations_per_pair = 10000  # Increased simulations for reliability
+    # Generate all strategy combinations
+    strategies = list(strategy_functions.keys())
+    strategy_combinations = list(product(strategies, strategies))  # 8x8=64 combinations
 
-print("Starting simulations...")
-for player_strat, opponent_strat in tqdm(strategy_combinations, desc="Strategy Pairs"):
-    player_wins, opponent_wins, draws, win_rate = simulate_multiple_games(
-        player_strat, opponent_strat, num_simulations=num_simulations_per_pair
+    simulation_results = [None] * len(strategy_combinations)
+    tables = {strategy: probability_table(strategy) for strategy in strategies}
+    # Adaptive pairs check their interval every 500 games, like simulate_games_adaptive
+    options = {'target_width': target_width, 'chunk_size': 500} if adaptive else {}
+    if store is not None:
+        matchups = cached_matchups(strategy_combinations, tables, num_simulations_per_pair, store,
+                                   MATRIX_RULES, master_seed=master_seed, workers=workers, **options)
+    else:
+        matchups = iter_matchups(strategy_combinations, tables, num_simulations_per_pair,
+                                 MATRIX_RULES, master_seed=master_seed, workers=workers, **options)
+    for index, (player_strat, opponent_strat), counts in matchups:
+        result = matchup_result(*counts)
+        simulation_results[index] = {
+            'Player Strategy': player_strat,
+            'Opponent Strategy': opponent_strat,
+            'Player Wins': result.player_wins,
+            'Opponent Wins': result.opponent_wins,
+            'Draws': result.draws,
+            'Win Rate (%)': result.win_rate,
+            'Games': result.games,
+            'CI Low (%)': result.ci_low,
+            'CI High (%)': result.ci_high
+        }
+
+    # Create a DataFrame
+    return pd.DataFrame(simulation_results)
+
+def plot_strategy_matrix(df_results, num_simulations_per_pair=10000, target_width=None):
+    """
+    Heatmap and grouped bar chart of the player win rate for every strategy pair.
+    Pass target_width for an adaptive sweep, so the titles give the interval width instead of a fixed count.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if target_width is None:
+        title = f'Player Win Rate (%) by Strategy Combination ({num_simulations_per_pair:,} Simulations Each)'
+    else:
+        title = (f'Player Win Rate (%) by Strategy Combination (up to {num_simulations_per_pair:,} Simulations, '
+                 f'95% CI width <= {target_width * 100:g} pts)')
+
+    # Pivot the DataFrame for heatmap
+    heatmap_data = df_results.pivot(
+        index='Player Strategy',
+        columns='Opponent Strategy',
+        values='Win Rate (%)'
+    )
+
+    # Set up the matplotlib figure for Heatmap
+    plt.figure(figsize=(16, 12))
+
+    # Create the heatmap
+    sns.heatmap(
+        heatmap_data, 
+        annot=True, 
+        fmt=".1f", 
+        cmap='YlGnBu', 
+        linewidths=.5, 
+        linecolor='gray'
     )
-    simulation_results.append({
-        'Player Strategy': player_strat,
-        'Opponent Strategy': opponent_strat,
-        'Player Wins': player_wins,
-        'Opponent Wins': opponent_wins,
-        'Draws': draws,
-        'Win Rate (%)': win_rate
-    })
 
-# Create a DataFrame
-df_results = pd.DataFrame(simulation_results)
-print("\nSimulation Results:")
-print(df_results)
+    # Add title and labels
+    plt.title(title, fontsize=16)
+    plt.xlabel('Opponent Strategy', fontsize=14)
+    plt.ylabel('Player Strategy', fontsize=14)
+
+    # Adjust layout for better appearance
+    plt.tight_layout()
 
-# Pivot the DataFrame for heatmap
-heatmap_data = df_results.pivot(
-    index='Player Strategy',
-    columns='Opponent Strategy',
-    values='Win Rate (%)'
-)
+    # Show the heatmap
+    plt.show()
 
-# Set up the matplotlib figure for Heatmap
-plt.figure(figsize=(16, 12))
+    # Alternative Visualization: Grouped Bar Chart
+    plt.figure(figsize=(20, 12))
+    sns.barplot(
+        x='Opponent Strategy',
+        y='Win Rate (%)',
+        hue='Player Strategy',
+        data=df_results,
+        palette='viridis'
+    )
 
-# Create the heatmap
-sns.heatmap(
-    heatmap_data, 
-    annot=True, 
-    fmt=".1f", 
-    cmap='YlGnBu', 
-    linewidths=.5, 
-    linecolor='gray'
-)
+    # Add title and labels
+    plt.title(title, fontsize=16)
+    plt.xlabel('Opponent Strategy', fontsize=14)
+    plt.ylabel('Win Rate (%)', fontsize=14)
 
-# Add title and labels
-plt.title('Player Win Rate (%) by Strategy Combination (10,000 Simulations Each)', fontsize=16)
-plt.xlabel('Opponent Strategy', fontsize=14)
-plt.ylabel('Player Strategy', fontsize=14)
+    # Move the legend outside the plot
+    plt.legend(title='Player Strategy', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=12)
 
-# Adjust layout for better appearance
-plt.tight_layout()
+    # Adjust layout for better appearance
+    plt.tight_layout()
 
-# Show the heatmap
-plt.show()
+    # Show the bar chart
+    plt.show()
 
-# Alternative Visualization: Grouped Bar Chart
-plt.figure(figsize=(20, 12))
-sns.barplot(
-    x='Opponent Strategy',
-    y='Win Rate (%)',
-    hue='Player Strategy',
-    data=df_results,
-    palette='viridis'
-)
+def main(argv=None):
+    """Command-line entry point: sweep every strategy pair and plot the results."""
+    import argparse
 
-# Add title and labels
-plt.title('Player Win Rate (%) by Strategy Combination (10,000 Simulations Each)', fontsize=16)
-plt.xlabel('Opponent Strategy', fontsize=14)
-plt.ylabel('Win Rate (%)', fontsize=14)
+    parser = argparse.ArgumentParser(description="Simulate every strategy-vs-strategy matchup.")
+    parser.add_argument('--simulations', type=int, default=10000, help="games per strategy pair (the cap with --adaptive)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="stop each pair once its 95%% win-rate interval is --target-width wide")
+    parser.add_argument('--target-width', type=float, default=0.02, help="interval width for --adaptive")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=2024, help="master seed")
+    parser.add_argument('--cache', default='strategy_matrix_cache.jsonl', help="result cache; pass '' to disable")
+    parser.add_argument('--no-plot', dest='plot', action='store_false', help="skip the matplotlib windows")
+    args = parser.parse_args(argv)
 
-# Move the legend outside the plot
-plt.legend(title='Player Strategy', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=12)
+    print("Starting simulations...")
+    df_results = run_strategy_matrix(args.simulations, args.seed, args.workers, args.cache or None,
+                                     args.adaptive, args.target_width)
+    print("\nSimulation Results:")
+    print(df_results)
+    if args.adaptive:
+        print(f"\n{df_results['Games'].sum():,} games played "
+              f"(fixed sweep: {len(df_results) * args.simulations:,}); "
+              f"widest 95% CI: {(df_results['CI High (%)'] - df_results['CI Low (%)']).max():.2f} pts")
 
-# Adjust layout for better appearance
-plt.tight_layout()
+    if args.plot:
+        plot_strategy_matrix(df_results, args.simulations, args.target_width if args.adaptive else None)
 
-# Show the bar chart
-plt.show()
+if __name__ == "__main__":
+    main()
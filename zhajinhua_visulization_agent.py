@@ -1,181 +1,13 @@
 import random
 import numpy as np
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from tqdm import tqdm
+from batch_simulator import AGENT_RULES, simulate_games_adaptive, simulate_games_batch, wilson_interval
+from markov_solver import solve_matchup
+from parallel_runner import iter_matchups
+from result_store import cached_matchups
+from strategies import OPPONENT_STRATEGIES, STRATEGIES, ai_strategy, probability_table
 
-# Define the AI strategy that transitions from conservative to moderate
-def ai_strategy(hand_strength, player_coins):
-    """
-    AI Strategy:
-    - Conservative when coins <= 3
-    - Moderate when coins > 3
-    """
-    if player_coins <= 3:
-        # Conservative logic
-        if hand_strength < 7:
-            return 'fold'
-        elif 7 <= hand_strength <= 9:
-            return 'bet1'
-        else:
-            return 'bet2'
-    else:
-        # Moderate logic
-        if hand_strength < 5:
-            return 'fold'
-        elif 5 <= hand_strength <= 8:
-            return 'bet1'
-        else:
-            return 'bet2'
-
-# Basic opponent strategies
-def conservative_strategy(hand_strength, player_coins):
-    if hand_strength < 5:
-        return 'fold'
-    elif 5 <= hand_strength <= 9:
-        return 'bet1'
-    else:
-        return 'bet2'
-
-def aggressive_strategy(hand_strength, player_coins):
-    if hand_strength < 1:
-        return 'fold'
-    elif 1 <= hand_strength < 5:
-        return 'bet1'
-    else:
-        return 'bet2'
-
-def moderate_strategy(hand_strength, player_coins):
-    if hand_strength < 4:
-        return 'fold'
-    elif 4 <= hand_strength <= 7:
-        return 'bet1'
-    else:
-        return 'bet2'
-
-def random_strategy(hand_strength, player_coins):
-    return random.choice(['fold', 'bet1', 'bet2'])
-
-# Composite opponent strategies
-def aggressive_moderate_strategy(hand_strength, player_coins):
-    """Aggressive when coins >= 5, Moderate otherwise"""
-    if player_coins >= 5:
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return moderate_strategy(hand_strength, player_coins)
-
-def aggressive_conservative_strategy(hand_strength, player_coins):
-    """Aggressive when coins >= 5, Conservative otherwise"""
-    if player_coins >= 5:
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return conservative_strategy(hand_strength, player_coins)
-
-def conservative_aggressive_strategy(hand_strength, player_coins):
-    """Conservative when coins <= 5, Aggressive otherwise"""
-    if player_coins <= 5:
-        return conservative_strategy(hand_strength, player_coins)
-    else:
-        return aggressive_strategy(hand_strength, player_coins)
-
-def moderate_aggressive_strategy(hand_strength, player_coins):
-    """Moderate when coins <= 5, Aggressive otherwise"""
-    if player_coins <= 5:
-        return moderate_strategy(hand_strength, player_coins)
-    else:
-        return aggressive_strategy(hand_strength, player_coins)
-
-def adaptive_aggressive_strategy(hand_strength, player_coins):
-    """Adapts aggression based on coin count"""
-    if player_coins >= 7:
-        # Very aggressive
-        if hand_strength < 1:
-            return 'fold'
-        else:
-            return 'bet2'
-    elif player_coins >= 4:
-        # Moderately aggressive
-        if hand_strength < 2:
-            return 'fold'
-        elif hand_strength < 6:
-            return 'bet1'
-        else:
-            return 'bet2'
-    else:
-        # Conservative
-        return conservative_strategy(hand_strength, player_coins)
-
-def cyclic_strategy(hand_strength, player_coins):
-    """Cycles between aggressive, moderate, and conservative based on coins"""
-    coin_cycle = player_coins % 3
-    if coin_cycle == 0:
-        return aggressive_strategy(hand_strength, player_coins)
-    elif coin_cycle == 1:
-        return moderate_strategy(hand_strength, player_coins)
-    else:
-        return conservative_strategy(hand_strength, player_coins)
-
-def balanced_strategy(hand_strength, player_coins):
-    """Balances between strategies based on hand strength and coins"""
-    if player_coins <= 3:
-        if hand_strength < 3:
-            return 'fold'
-        elif hand_strength < 7:
-            return 'bet1'
-        else:
-            return 'bet2'
-    else:
-        if hand_strength < 4:
-            return 'fold'
-        elif hand_strength < 8:
-            return 'bet1'
-        else:
-            return 'bet2'
-
-def risky_conservative_strategy(hand_strength, player_coins):
-    """Conservative with occasional high-risk plays"""
-    if random.random() < 0.2:  # 20% chance of aggressive play
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return conservative_strategy(hand_strength, player_coins)
-
-def progressive_strategy(hand_strength, player_coins):
-    """Becomes more aggressive as coins increase"""
-    aggression_threshold = min(player_coins / 10, 1)  # Scale with coins
-    if random.random() < aggression_threshold:
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return moderate_strategy(hand_strength, player_coins)
-
-def coin_aware_strategy(hand_strength, player_coins):
-    """Adapts strategy based on exact coin count"""
-    if player_coins <= 2:
-        return conservative_strategy(hand_strength, player_coins)
-    elif player_coins <= 4:
-        return moderate_strategy(hand_strength, player_coins)
-    elif player_coins <= 6:
-        return aggressive_strategy(hand_strength, player_coins)
-    else:
-        return balanced_strategy(hand_strength, player_coins)
-
-# Mapping opponent strategy names to functions
-opponent_strategies = {
-    'Conservative': conservative_strategy,
-    'Aggressive': aggressive_strategy,
-    'Moderate': moderate_strategy,
-    'Random': random_strategy,
-    'Aggressive-Moderate': aggressive_moderate_strategy,
-    'Aggressive-Conservative': aggressive_conservative_strategy,
-    'Conservative-Aggressive': conservative_aggressive_strategy,
-    'Moderate-Aggressive': moderate_aggressive_strategy,
-    'Adaptive-Aggressive': adaptive_aggressive_strategy,
-    'Cyclic': cyclic_strategy,
-    'Balanced': balanced_strategy,
-    'Risky-Conservative': risky_conservative_strategy,
-    'Progressive': progressive_strategy,
-    'Coin-Aware': coin_aware_strategy
-}
+# Mapping opponent strategy names to functions (see strategies.py)
+opponent_strategies = {name: STRATEGIES[name] for name in OPPONENT_STRATEGIES}
 
 def simulate_round(opponent_strategy, player_coins, opponent_coins):
     """Simulate a single round of the game."""
@@ -251,16 +83,86 @@ def simulate_game(opponent_strategy, starting_coins=5, max_rounds=1000):
     else:
         return 'Draw'
 
-def run_simulations(num_simulations=10000):
-    """Run simulations against all opponent strategies."""
+def run_simulations(num_simulations=10000, batched=False, rng=None, parallel=False, workers=None, master_seed=0,
+                    exact=False, adaptive=False, target_width=0.02, store=None):
+    """
+    Run simulations against all opponent strategies.
+    batched=True plays each strategy's games in lockstep with NumPy (see batch_simulator).
+    parallel=True also shards the games across a process pool of `workers` processes
+    (see parallel_runner); results are then reproducible from master_seed alone.
+    With parallel=True, store names a result cache file (see result_store): every finished
+    strategy is checkpointed there, and re-runs only simulate missing or changed strategies.
+    Only parallel sweeps are seeded well enough to cache, so store raises ValueError otherwise.
+    exact=True solves each matchup as a Markov chain instead (see markov_solver) and
+    reports expected counts over num_simulations games, with no sampling noise.
+    adaptive=True plays batched chunks per strategy until the 95% Wilson interval of the
+    win rate is at most target_width wide (num_simulations caps the games), and adds the
+    'Games', 'CI Low (%)' and 'CI High (%)' columns.
+    """
+    import pandas as pd
+    from tqdm import tqdm
+
+    if store is not None and not parallel:
+        raise ValueError("store is only used by parallel sweeps; pass parallel=True or store=None")
+
     results = []
+
+    if adaptive:
+        for opponent_strategy in tqdm(opponent_strategies.keys(), desc="Simulating strategies"):
+            (ai_wins, opponent_wins, draws), games = simulate_games_adaptive(
+                probability_table('AI'), probability_table(opponent_strategy), AGENT_RULES,
+                target_width, max_games=num_simulations, rng=rng
+            )
+            low, high = wilson_interval(ai_wins, games)
+            results.append({
+                'Opponent Strategy': opponent_strategy,
+                'AI Wins': ai_wins,
+                'Opponent Wins': opponent_wins,
+                'Draws': draws,
+                'Win Rate (%)': ai_wins / games * 100,
+                'Games': games,
+                'CI Low (%)': low * 100,
+                'CI High (%)': high * 100
+            })
+        return pd.DataFrame(results)
+
+    if parallel:
+        pairs = [('AI', opponent_strategy) for opponent_strategy in opponent_strategies]
+        tables = {strategy: probability_table(strategy) for strategy in ['AI', *opponent_strategies]}
+        results = [None] * len(pairs)
+        if store is not None:
+            matchups = cached_matchups(pairs, tables, num_simulations, store, AGENT_RULES,
+                                       master_seed=master_seed, workers=workers)
+        else:
+            matchups = iter_matchups(pairs, tables, num_simulations, AGENT_RULES,
+                                     master_seed=master_seed, workers=workers)
+        for index, (_, opponent_strategy), (ai_wins, opponent_wins, draws) in matchups:
+            results[index] = {
+                'Opponent Strategy': opponent_strategy,
+                'AI Wins': ai_wins,
+                'Opponent Wins': opponent_wins,
+                'Draws': draws,
+                'Win Rate (%)': ai_wins / num_simulations * 100
+            }
+        return pd.DataFrame(results)
     
     for opponent_strategy in tqdm(opponent_strategies.keys(), desc="Simulating strategies"):
         strategy_results = {'AI': 0, 'Opponent': 0, 'Draw': 0}
         
-        for _ in range(num_simulations):
-            outcome = simulate_game(opponent_strategy)
-            strategy_results[outcome] += 1
+        if exact:
+            probabilities = solve_matchup(probability_table('AI'), probability_table(opponent_strategy), AGENT_RULES)
+            strategy_results['AI'], strategy_results['Opponent'], strategy_results['Draw'] = (
+                p * num_simulations for p in probabilities
+            )
+        elif batched:
+            strategy_results['AI'], strategy_results['Opponent'], strategy_results['Draw'] = simulate_games_batch(
+                probability_table('AI'), probability_table(opponent_strategy),
+                num_simulations, AGENT_RULES, rng=rng
+            )
+        else:
+            for _ in range(num_simulations):
+                outcome = simulate_game(opponent_strategy)
+                strategy_results[outcome] += 1
         
         win_rate = (strategy_results['AI'] / num_simulations) * 100
         results.append({
@@ -275,6 +177,10 @@ def run_simulations(num_simulations=10000):
 
 def create_win_rate_heatmap(df_results):
     """Create a heatmap showing win rates against different strategies."""
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
     plt.figure(figsize=(15, 10))
     
     # Prepare data for heatmap
@@ -302,6 +208,8 @@ def create_win_rate_heatmap(df_results):
 
 def create_detailed_bar_plot(df_results):
     """Create a detailed bar plot with win/loss/draw breakdown."""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(15, 8))
     
     # Calculate percentages
@@ -333,6 +241,8 @@ def create_detailed_bar_plot(df_results):
 
 def create_performance_radar(df_results):
     """Create a radar chart showing AI performance metrics."""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(12, 12))
     
     # Prepare data for radar chart
@@ -364,15 +274,41 @@ def create_performance_radar(df_results):
     plt.tight_layout()
     plt.show()
 
-# Run simulations and create visualizations
-if __name__ == "__main__":
-    print("Running simulations...")
-    df_results = run_simulations()
+def create_strategy_type_plot(basic_avg, composite_avg):
+    """Bar chart of the average win rate against basic and composite strategies."""
+    import matplotlib.pyplot as plt
 
-    # Create visualizations
-    create_win_rate_heatmap(df_results)
-    create_detailed_bar_plot(df_results)
-    create_performance_radar(df_results)
+    plt.figure(figsize=(15, 8))
+    strategy_types = ['Basic Strategies', 'Composite Strategies']
+    avg_rates = [basic_avg, composite_avg]
+    
+    plt.bar(strategy_types, avg_rates, color=['#3498db', '#e74c3c'])
+    plt.title('AI Performance Against Strategy Types')
+    plt.xlabel('Strategy Type')
+    plt.ylabel('Average Win Rate (%)')
+    plt.axhline(y=50, color='black', linestyle='--', alpha=0.5, label='50% Threshold')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+def create_win_rate_distribution(df_results):
+    """Box plot of the AI's win rates over all opponent strategies."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(15, 6))
+    sns.boxplot(data=df_results, x='Win Rate (%)', whis=1.5)
+    plt.title('Distribution of AI Win Rates')
+    plt.axvline(x=50, color='r', linestyle='--', alpha=0.5, label='50% Threshold')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+def print_analysis(df_results, plot=True):
+    """Print the summary statistics of a run_simulations result, with the group plots if plot is set."""
+    import pandas as pd
 
     # Print enhanced statistics
     print("\nDetailed Strategy Analysis:")
@@ -395,42 +331,15 @@ if __name__ == "__main__":
     basic_strategies = ['Conservative', 'Aggressive', 'Moderate', 'Random']
     composite_strategies = [s for s in df_results['Opponent Strategy'] if s not in basic_strategies]
 
-    # Calculate strategy grouping statistics
-    print("\nStrategy Group Analysis:")
-    print("-" * 60)
-    basic_strategies = ['Conservative', 'Aggressive', 'Moderate', 'Random']
-    composite_strategies = [s for s in df_results['Opponent Strategy'] if s not in basic_strategies]
-
     basic_avg = df_results[df_results['Opponent Strategy'].isin(basic_strategies)]['Win Rate (%)'].mean()
     composite_avg = df_results[df_results['Opponent Strategy'].isin(composite_strategies)]['Win Rate (%)'].mean()
 
     print(f"Average Win Rate vs Basic Strategies: {basic_avg:.2f}%")
     print(f"Average Win Rate vs Composite Strategies: {composite_avg:.2f}%")
 
-    # Create performance comparison plot
-    plt.figure(figsize=(15, 8))
-    strategy_types = ['Basic Strategies', 'Composite Strategies']
-    avg_rates = [basic_avg, composite_avg]
-    
-    plt.bar(strategy_types, avg_rates, color=['#3498db', '#e74c3c'])
-    plt.title('AI Performance Against Strategy Types')
-    plt.xlabel('Strategy Type')
-    plt.ylabel('Average Win Rate (%)')
-    plt.axhline(y=50, color='black', linestyle='--', alpha=0.5, label='50% Threshold')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
-
-    # Create win rate distribution plot
-    plt.figure(figsize=(15, 6))
-    sns.boxplot(data=df_results, x='Win Rate (%)', whis=1.5)
-    plt.title('Distribution of AI Win Rates')
-    plt.axvline(x=50, color='r', linestyle='--', alpha=0.5, label='50% Threshold')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
+    if plot:
+        create_strategy_type_plot(basic_avg, composite_avg)
+        create_win_rate_distribution(df_results)
 
     # Print strategy-specific statistics
     print("\nStrategy-Specific Statistics:")
@@ -451,12 +360,58 @@ if __name__ == "__main__":
                                                'Moderately Effective', 
                                                'Less Effective vs AI'])
     
-    effectiveness_summary = df_results.groupby('Effectiveness')['Opponent Strategy'].apply(list)
+    effectiveness_summary = df_results.groupby('Effectiveness', observed=False)['Opponent Strategy'].apply(list)
     for tier, strategies in effectiveness_summary.items():
         print(f"\n{tier}:")
         for strategy in strategies:
             print(f"- {strategy}")
 
+def main(argv=None):
+    """Command-line entry point: simulate the AI against every opponent strategy and report."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Evaluate the AI strategy against every opponent strategy.")
+    parser.add_argument('--simulations', type=int, default=10000, help="games per opponent strategy")
+    parser.add_argument('--mode', choices=['parallel', 'batched', 'exact', 'adaptive', 'scalar'], default='parallel',
+                        help="how games are simulated (default: parallel)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for --mode parallel")
+    parser.add_argument('--seed', type=int, default=0, help="master seed for --mode parallel")
+    parser.add_argument('--cache', default=None,
+                        help="result cache for --mode parallel (default: ai_strategy_results_cache.jsonl); "
+                             "pass '' to disable")
+    parser.add_argument('--target-width', type=float, default=0.02, help="interval width for --mode adaptive")
+    parser.add_argument('--output', default='ai_strategy_analysis_results.csv', help="CSV file for the results")
+    parser.add_argument('--no-plot', dest='plot', action='store_false', help="skip the matplotlib windows")
+    args = parser.parse_args(argv)
+    if args.cache is None:
+        args.cache = 'ai_strategy_results_cache.jsonl' if args.mode == 'parallel' else ''
+    elif args.cache and args.mode != 'parallel':
+        parser.error("--cache needs --mode parallel")
+
+    print("Running simulations...")
+    df_results = run_simulations(
+        args.simulations,
+        batched=args.mode == 'batched',
+        parallel=args.mode == 'parallel',
+        exact=args.mode == 'exact',
+        adaptive=args.mode == 'adaptive',
+        target_width=args.target_width,
+        workers=args.workers,
+        master_seed=args.seed,
+        store=args.cache or None
+    )
+
+    # Create visualizations
+    if args.plot:
+        create_win_rate_heatmap(df_results)
+        create_detailed_bar_plot(df_results)
+        create_performance_radar(df_results)
+
+    print_analysis(df_results, plot=args.plot)
+
     # Save results to CSV
-    df_results.to_csv('ai_strategy_analysis_results.csv', index=False)
-    print("\nResults have been saved to 'ai_strategy_analysis_results.csv'")
\ No newline at end of file
+    df_results.to_csv(args.output, index=False)
+    print(f"\nResults have been saved to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file